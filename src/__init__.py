@@ -1,4 +1,10 @@
-from .gui import CambioExactoApp
+# La GUI (y con ella flet) se importa solo cuando se pide CambioExactoApp,
+# así que los módulos del solver y la línea de comandos arrancan rápido.
+__all__ = ["CambioExactoApp"]
 
 
-__all__ = ["CambioExactoApp"]
+def __getattr__(name):
+    if name == "CambioExactoApp":
+        from .gui import CambioExactoApp
+        return CambioExactoApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,161 @@
+import json
+from math import prod
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+
+_INFINITY = np.iinfo(np.int64).max // 2
+
+
+class AllTargetsTable:
+    """
+    Respuestas para todas las cantidades entre 0 y max_amount con un mismo
+    juego de denominaciones y límites: si hay cambio exacto, el mínimo de
+    monedas, cuántas combinaciones hay y una combinación con el mínimo de
+    monedas. Todo se calcula en una pasada vectorizada con NumPy:
+      - mínimo y testigo: cada límite se divide en trozos 1, 2, 4, ... que
+        se tratan como objetos 0/1 (actualización fuera de lugar); una matriz
+        de "tomado" por trozo permite reconstruir a la vez el testigo de
+        todas las cantidades;
+      - conteo: sumas acumuladas con paso d por denominación y una resta
+        desplazada (l+1)·d. Se usa uint64 cuando el total de combinaciones
+        cabe (la aritmética modular da el valor exacto) y enteros de Python
+        si no.
+    Cada consulta es O(1). La tabla se guarda con save() en un directorio de
+    archivos .npy y load() la abre con memoria mapeada.
+    """
+
+    def __init__(self, denominations: List[int], limits: List[int], max_amount: int):
+        if len(denominations) != len(limits):
+            raise ValueError("La cantidad de denominaciones y límites debe ser igual.")
+        if max_amount < 0:
+            raise ValueError("max_amount no puede ser negativo.")
+        if any(denom <= 0 for denom in denominations):
+            raise ValueError("Las denominaciones deben ser positivas.")
+        self.denominations = list(denominations)
+        self.limits = list(limits)
+        self.max_amount = max_amount
+        self._min_coins = self._build_min_coins()
+        self._counts = self._build_counts()
+
+    def _build_min_coins(self) -> np.ndarray:
+        size = self.max_amount + 1
+        best = np.full(size, _INFINITY, dtype=np.int64)
+        best[0] = 0
+        chunks = []
+        for pos, (denom, limit) in enumerate(zip(self.denominations, self.limits)):
+            chunk = 1
+            left = limit
+            while left > 0:
+                take = min(chunk, left)
+                width = take * denom
+                if width < size:
+                    candidate = best[:size - width] + take
+                    taken = np.zeros(size, dtype=bool)
+                    taken[width:] = candidate < best[width:]
+                    best = best.copy()
+                    np.minimum(best[width:], candidate, out=best[width:])
+                    chunks.append((pos, take, width, taken))
+                left -= take
+                chunk *= 2
+
+        # Reconstruir el testigo de todas las cantidades, del último trozo al primero
+        feasible = best < _INFINITY
+        witness_type = np.uint32 if max(self.limits, default=0) < 2 ** 32 else np.uint64
+        witness = np.zeros((size, len(self.denominations)), dtype=witness_type)
+        amounts = np.arange(size)
+        for pos, take, width, taken in reversed(chunks):
+            hit = taken[amounts]
+            witness[hit, pos] += take
+            amounts = amounts - hit * width
+        witness[~feasible] = 0
+        self._witness = witness
+        return np.where(feasible, best, -1)
+
+    def _build_counts(self) -> np.ndarray:
+        size = self.max_amount + 1
+        exact = prod(limit + 1 for limit in self.limits) < 2 ** 64
+        count_type = np.uint64 if exact else object
+        ways = np.zeros(size, dtype=count_type)
+        ways[0] = 1
+        for denom, limit in zip(self.denominations, self.limits):
+            # prefix[a] = ways[a] + ways[a-d] + ways[a-2d] + ...
+            padded = np.zeros(-(-size // denom) * denom, dtype=count_type)
+            padded[:size] = ways
+            prefix = padded.reshape(-1, denom).cumsum(axis=0, dtype=count_type).reshape(-1)[:size]
+            window = (limit + 1) * denom
+            ways = prefix.copy()
+            if window < size:
+                ways[window:] -= prefix[:size - window]
+        return ways
+
+    def _check(self, amount: int) -> bool:
+        return 0 <= amount <= self.max_amount
+
+    def feasible(self, amount: int) -> bool:
+        """¿Existe cambio exacto para amount?"""
+        return self._check(amount) and bool(self._min_coins[amount] >= 0)
+
+    def min_coins(self, amount: int) -> Optional[int]:
+        """Mínimo de monedas para amount, o None si no hay cambio exacto."""
+        if not self.feasible(amount):
+            return None
+        return int(self._min_coins[amount])
+
+    def count(self, amount: int) -> int:
+        """Cantidad de combinaciones (contar_soluciones) para amount."""
+        if not self._check(amount):
+            return 0
+        value = self._counts[amount]
+        if self._counts.ndim == 2:     # Enteros grandes guardados como bytes
+            return int.from_bytes(value.tobytes(), 'little')
+        return int(value)
+
+    def witness(self, amount: int) -> Optional[Dict[str, Any]]:
+        """Una solución con el mínimo de monedas, con la forma de backtrack_cambio_exacto."""
+        if not self.feasible(amount):
+            return None
+        return {
+            'combination': [int(count) for count in self._witness[amount]],
+            'sum': amount
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return self._min_coins.nbytes + self._witness.nbytes + self._counts.nbytes
+
+    def save(self, path) -> None:
+        """Guarda la tabla en el directorio path (se crea si no existe)."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        counts = self._counts
+        if counts.dtype == object:
+            width = max(int(value).bit_length() for value in counts) // 8 + 1
+            counts = np.frombuffer(
+                b''.join(int(value).to_bytes(width, 'little') for value in counts), dtype=np.uint8
+            ).reshape(-1, width)
+        np.save(path / 'min_coins.npy', self._min_coins)
+        np.save(path / 'witness.npy', self._witness)
+        np.save(path / 'counts.npy', counts)
+        (path / 'meta.json').write_text(json.dumps({
+            'denominations': self.denominations,
+            'limits': self.limits,
+            'max_amount': self.max_amount,
+        }), encoding='utf-8')
+
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> 'AllTargetsTable':
+        """Abre una tabla guardada; con mmap los arreglos se leen del disco bajo demanda."""
+        path = Path(path)
+        meta = json.loads((path / 'meta.json').read_text(encoding='utf-8'))
+        mode = 'r' if mmap else None
+        table = cls.__new__(cls)
+        table.denominations = meta['denominations']
+        table.limits = meta['limits']
+        table.max_amount = meta['max_amount']
+        table._min_coins = np.load(path / 'min_coins.npy', mmap_mode=mode)
+        table._witness = np.load(path / 'witness.npy', mmap_mode=mode)
+        table._counts = np.load(path / 'counts.npy', mmap_mode=mode)
+        return table
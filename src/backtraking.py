@@ -1,80 +1,419 @@
-from typing import List, Dict, Any
+from math import gcd
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Tuple, Union
+
+from .hooks import HookedRecorder, SearchCancelled, SearchHooks
+from .memo import MemoCache
+from .reachability import ReachabilityTable
+from .step_trace import (
+    EXPLORANDO, PODADO, SOLUCION, RAMA_MUERTA, INALCANZABLE, NO_DIVISIBLE, MEMORIZADO,
+    STATUS_NAMES, TRACE_FULL, make_recorder,
+)
+
+
+ORDER_DESC = 'desc'
+
+
+class SearchInstance(NamedTuple):
+    """
+    Instancia preprocesada para la búsqueda.
+    Las denominaciones y límites están en el orden de búsqueda; order[k]
+    es el índice original de la denominación explorada en el nivel k
+    (None si se conserva el orden del llamador).
+    suffix_max[k] es la suma máxima alcanzable con las denominaciones k..n-1
+    y suffix_gcd[k] el mcd de las que tienen límite positivo (0 si ninguna).
+    """
+    denominations: List[int]
+    limits: List[int]
+    order: Optional[List[int]]
+    suffix_max: List[int]
+    suffix_gcd: List[int]
+
+
+def prepare_instance(
+    denominations: List[int],
+    limits: List[int],
+    order: Optional[str] = None
+) -> SearchInstance:
+    """
+    Preprocesa la instancia: reordena las denominaciones si se pide
+    (order='desc' explora primero las de mayor valor) y calcula las sumas
+    máximas y los mcd de cada sufijo para las podas.
+    """
+    if len(denominations) != len(limits):
+        raise ValueError("La cantidad de denominaciones y límites debe ser igual.")
+    if any(denom <= 0 for denom in denominations):
+        raise ValueError("Las denominaciones deben ser positivas.")
+    if order is None:
+        permutation = None
+    elif order == ORDER_DESC:
+        permutation = sorted(range(len(denominations)), key=lambda i: -denominations[i])
+        denominations = [denominations[i] for i in permutation]
+        limits = [limits[i] for i in permutation]
+    else:
+        raise ValueError(f"Orden desconocido: {order!r} (usa None o {ORDER_DESC!r})")
+
+    num_denominations = len(denominations)
+    suffix_max = [0] * (num_denominations + 1)
+    suffix_gcd = [0] * (num_denominations + 1)
+    for pos in range(num_denominations - 1, -1, -1):
+        suffix_max[pos] = suffix_max[pos + 1] + denominations[pos] * limits[pos]
+        suffix_gcd[pos] = gcd(suffix_gcd[pos + 1], denominations[pos]) if limits[pos] else suffix_gcd[pos + 1]
+
+    return SearchInstance(list(denominations), list(limits), permutation, suffix_max, suffix_gcd)
+
+
+def _cut_status(instance: SearchInstance, pos: int, remaining: int) -> int:
+    """Devuelve el estado de poda de un nodo sin solución posible, o -1."""
+    if remaining > instance.suffix_max[pos]:
+        return INALCANZABLE
+    if remaining % instance.suffix_gcd[pos]:
+        return NO_DIVISIBLE
+    return -1
+
+
+def _caller_order(combination: List[int], order: Optional[List[int]]) -> List[int]:
+    """Lleva una combinación en orden de búsqueda al orden del llamador."""
+    if order is None:
+        return combination
+    result = [0] * len(combination)
+    for pos, index in enumerate(order):
+        result[index] = combination[pos]
+    return result
+
+
+def _reachability_for(
+    instance: SearchInstance,
+    target_amount: int,
+    reachability: Union[bool, ReachabilityTable]
+) -> Optional[ReachabilityTable]:
+    """Construye o valida la tabla de alcanzabilidad para la búsqueda."""
+    if reachability is False or reachability is None:
+        return None
+    if reachability is True:
+        return ReachabilityTable(instance.denominations, instance.limits, max(target_amount, 0))
+    if reachability.denominations != instance.denominations or reachability.limits != instance.limits:
+        raise ValueError("La tabla de alcanzabilidad es de otra instancia u otro orden de búsqueda.")
+    if target_amount > reachability.max_amount:
+        raise ValueError("La tabla de alcanzabilidad no cubre el objetivo.")
+    return reachability
+
+
+def _no_record(pos: int, current_sum: int, status: int, count: int, parent: int) -> int:
+    return -1
 
 
 def backtrack_cambio_exacto(
     denominations: List[int],
     limits: List[int],
-    target_amount: int
+    target_amount: int,
+    trace: str = TRACE_FULL,
+    prune: bool = True,
+    order: Optional[str] = None,
+    memo: Optional[MemoCache] = None,
+    reachability: Union[bool, ReachabilityTable] = False,
+    hooks: Union[SearchHooks, List[SearchHooks], None] = None
 ) -> Dict[str, Any]:
     """
     Algoritmo de backtracking optimizado para el problema de cambio exacto.
     Cuando encuentra una solución válida, no explora denominaciones restantes.
+    El parámetro trace elige cuánto se registra del recorrido:
+      - 'full': traza completa compacta (StepTrace)
+      - 'counters': solo contadores de pasos por estado (StepCounters)
+      - 'none': nada
+    Con prune=True corta los nodos cuyo resto supera lo que suman las
+    denominaciones restantes ('inalcanzable') o no es múltiplo de su mcd
+    ('no divisible'), y deja de probar cantidades tras el primer exceso.
+    Con order='desc' explora primero las denominaciones mayores; las
+    combinaciones se devuelven siempre en el orden del llamador.
+    La búsqueda es iterativa con una pila explícita, así que no depende del
+    límite de recursión aunque haya cientos de denominaciones.
+    Con memo (una MemoCache) se recuerdan los estados (nivel, resto) cuyo
+    subárbol no tiene soluciones y se saltan con el estado 'memorizado'.
+    Con reachability=True (o una ReachabilityTable ya construida para las
+    mismas denominaciones en orden de búsqueda) solo se entra en los hijos
+    cuyo resto es alcanzable, así que desaparecen las ramas muertas.
+    Con hooks (SearchHooks o una lista, p. ej. un LevelProfiler) se avisa de
+    cada nodo explorado, poda, solución y rama muerta; sin hooks no hay
+    costo extra. Un SearchBudget entre los hooks puede detener la búsqueda.
     Devuelve un diccionario con:
       - 'solutions': lista de soluciones encontradas
-      - 'steps': lista de todos los pasos explorados (para visualización)
+      - 'steps': traza de los pasos explorados (None con trace='none');
+        en modo 'full' se usa como la lista de pasos para visualización
+      - 'interrupted': motivo si la búsqueda se detuvo antes de terminar
+        (las soluciones y la traza son entonces parciales), o None
+    """
+    instance = prepare_instance(denominations, limits, order)
+    steps = make_recorder(trace, len(denominations), instance.order)
+    reach = _reachability_for(instance, target_amount, reachability)
+    recorder = steps if hooks is None else HookedRecorder(hooks, steps)
+    solutions = []
+    interrupted = None
+    try:
+        search_subtree(instance, target_amount, recorder, prune, memo, reach=reach, solutions=solutions)
+    except SearchCancelled as cancelled:
+        interrupted = cancelled.reason
+    return {
+        'solutions': solutions,
+        'steps': steps,
+        'interrupted': interrupted
+    }
+
+
+def search_subtree(
+    instance: SearchInstance,
+    target_amount: int,
+    steps=None,
+    prune: bool = True,
+    memo: Optional[MemoCache] = None,
+    prefix: Tuple[int, ...] = (),
+    reach: Optional[ReachabilityTable] = None,
+    solutions: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
     """
+    Motor de backtrack_cambio_exacto sobre una instancia preprocesada.
+    Explora el subárbol del nodo que fija las primeras len(prefix)
+    denominaciones (en orden de búsqueda) a las cantidades de prefix; con
+    prefix=() recorre el árbol completo. Registra los pasos en steps
+    (StepTrace, StepCounters o None) y devuelve las soluciones encontradas.
+    Con reach solo desciende a hijos con resto alcanzable. Si se pasa la
+    lista solutions, las soluciones se agregan ahí a medida que aparecen.
+    """
+    denominations, limits = instance.denominations, instance.limits
+    suffix_max, suffix_gcd = instance.suffix_max, instance.suffix_gcd
     num_denominations = len(denominations)
     current_combination = [0] * num_denominations
-    solutions = []
-    steps = []
+    if solutions is None:
+        solutions = []
+    tracing = steps is not None
+    record = steps.append if tracing else _no_record
+
+    # Pila explícita: la profundidad es el nivel, así que basta un valor por
+    # nivel para la suma del nodo, su índice en la traza y su última cantidad
+    level_sums = [0] * num_denominations
+    level_nodes = [-1] * num_denominations
+    level_max_counts = [0] * num_denominations
+    level_solutions = [0] * num_denominations
+    if memo is not None:
+        memo.bind(denominations, limits)
 
-    def _backtrack(pos: int, current_sum: int):
+    start_pos = len(prefix)
+    current_combination[:start_pos] = prefix
+    current_sum = sum(c * d for c, d in zip(prefix, denominations))
+    count = prefix[-1] if prefix else 0
+    node, pos, parent = -1, start_pos, -1
+    while True:
         # Guardar paso explorado
-        steps.append({
-            'pos': pos,
-            'current_sum': current_sum,
-            'combination': list(current_combination),
-            'status': 'explorando'
-        })
+        if tracing:
+            node = record(pos, current_sum, EXPLORANDO, count, parent)
 
         # Caso base 1: Suma excede el objetivo (poda)
         if current_sum > target_amount:
-            steps.append({
-                'pos': pos,
-                'current_sum': current_sum,
-                'combination': list(current_combination),
-                'status': 'podado'
-            })
-            return
+            if tracing:
+                record(pos, current_sum, PODADO, count, parent)
 
         # Caso base 2: Suma exacta encontrada
-        if current_sum == target_amount:
+        elif current_sum == target_amount:
             # Completar la combinación con ceros para las denominaciones restantes
             complete_combination = list(current_combination)
             for i in range(pos, num_denominations):
                 complete_combination[i] = 0
-            
+
             solutions.append({
-                'combination': complete_combination,
+                'combination': _caller_order(complete_combination, instance.order),
                 'sum': current_sum
             })
-            steps.append({
-                'pos': pos,
-                'current_sum': current_sum,
-                'combination': complete_combination,
-                'status': 'solución'
-            })
-            return
+            if tracing:
+                record(pos, current_sum, SOLUCION, count, parent)
 
         # Caso base 3: Llegamos al final sin encontrar solución
-        if pos == num_denominations:
-            steps.append({
-                'pos': pos,
-                'current_sum': current_sum,
-                'combination': list(current_combination),
-                'status': 'rama muerta'
-            })
+        elif pos == num_denominations:
+            if tracing:
+                record(pos, current_sum, RAMA_MUERTA, count, parent)
+
+        else:
+            # Poda: las denominaciones restantes no pueden completar el objetivo
+            remaining = target_amount - current_sum
+            if reach is not None and not reach.reachable(pos, remaining):
+                if tracing:
+                    record(pos, current_sum, INALCANZABLE, count, parent)
+                max_count = -1
+            elif not prune:
+                max_count = limits[pos]
+            elif remaining > suffix_max[pos]:
+                if tracing:
+                    record(pos, current_sum, INALCANZABLE, count, parent)
+                max_count = -1
+            elif remaining % suffix_gcd[pos]:
+                if tracing:
+                    record(pos, current_sum, NO_DIVISIBLE, count, parent)
+                max_count = -1
+            else:
+                max_count = remaining // denominations[pos] + 1
+                if max_count > limits[pos]:
+                    max_count = limits[pos]
+
+            # Memoria: el mismo (nivel, resto) ya se exploró sin soluciones
+            if max_count >= 0 and memo is not None and memo.is_dead(pos, remaining):
+                if tracing:
+                    record(pos, current_sum, MEMORIZADO, count, parent)
+                max_count = -1
+
+            # Descender a la primera cantidad de la denominación actual
+            if max_count >= 0:
+                count = 0 if reach is None else reach.next_count(pos, remaining, 0, max_count)
+                current_combination[pos] = count
+                level_sums[pos] = current_sum
+                level_nodes[pos] = node
+                level_max_counts[pos] = max_count
+                level_solutions[pos] = len(solutions)
+                current_sum += count * denominations[pos]
+                parent = node
+                pos += 1
+                continue
+
+        # Retroceder hasta el nivel que aún tiene cantidades por probar
+        pos -= 1
+        while pos >= start_pos:
+            count = current_combination[pos]
+            if count < level_max_counts[pos]:
+                if reach is None:
+                    count += 1
+                    break
+                count = reach.next_count(pos, target_amount - level_sums[pos], count + 1, level_max_counts[pos])
+                if count >= 0:
+                    break
+            if memo is not None:
+                memo.put(pos, target_amount - level_sums[pos], len(solutions) - level_solutions[pos])
+            pos -= 1
+        else:
+            break
+        current_combination[pos] = count
+        current_sum = level_sums[pos] + count * denominations[pos]
+        parent = level_nodes[pos]
+        pos += 1
+
+    return solutions
+
+
+def iter_steps(
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int,
+    prune: bool = True,
+    order: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Versión perezosa de los pasos de backtrack_cambio_exacto.
+    Genera los mismos pasos en el mismo orden, uno a uno, sin guardar el
+    recorrido: la memoria es constante por nivel del árbol y el consumidor
+    puede detenerse en cualquier momento.
+    """
+    instance = prepare_instance(denominations, limits, order)
+    denominations, limits = instance.denominations, instance.limits
+    num_denominations = len(denominations)
+    current_combination = [0] * num_denominations
+    level_sums = [0] * num_denominations
+    level_max_counts = [0] * num_denominations
+
+    def _step(pos: int, current_sum: int, status: str) -> Dict[str, Any]:
+        combination = list(current_combination)
+        for i in range(pos, num_denominations):
+            combination[i] = 0
+        return {
+            'pos': pos,
+            'current_sum': current_sum,
+            'combination': _caller_order(combination, instance.order),
+            'status': status
+        }
+
+    pos, current_sum = 0, 0
+    while True:
+        yield _step(pos, current_sum, 'explorando')
+
+        if current_sum > target_amount:
+            yield _step(pos, current_sum, 'podado')
+        elif current_sum == target_amount:
+            yield _step(pos, current_sum, 'solución')
+        elif pos == num_denominations:
+            yield _step(pos, current_sum, 'rama muerta')
+        else:
+            remaining = target_amount - current_sum
+            status = -1
+            if prune:
+                status = _cut_status(instance, pos, remaining)
+                max_count = min(limits[pos], remaining // denominations[pos] + 1)
+            else:
+                max_count = limits[pos]
+
+            if status >= 0:
+                yield _step(pos, current_sum, STATUS_NAMES[status])
+            else:
+                current_combination[pos] = 0
+                level_sums[pos] = current_sum
+                level_max_counts[pos] = max_count
+                pos += 1
+                continue
+
+        pos -= 1
+        while pos >= 0 and current_combination[pos] == level_max_counts[pos]:
+            pos -= 1
+        if pos < 0:
             return
+        current_combination[pos] += 1
+        current_sum = level_sums[pos] + current_combination[pos] * denominations[pos]
+        pos += 1
 
-        # Explorar posibles cantidades para la denominación actual
-        for i in range(limits[pos] + 1):
-            current_combination[pos] = i
-            new_pos = pos + 1
-            new_sum = current_sum + i * denominations[pos]
-            _backtrack(new_pos, new_sum)
 
-    _backtrack(0, 0)
-    return {
-        'solutions': solutions,
-        'steps': steps
-    }
+def iter_solutions(
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int,
+    prune: bool = True,
+    order: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Versión perezosa de las soluciones de backtrack_cambio_exacto.
+    Genera cada solución ({'combination', 'sum'}) en cuanto se encuentra,
+    en el mismo orden, sin construir la lista de pasos.
+    """
+    instance = prepare_instance(denominations, limits, order)
+    denominations, limits = instance.denominations, instance.limits
+    num_denominations = len(denominations)
+    current_combination = [0] * num_denominations
+    level_sums = [0] * num_denominations
+    level_max_counts = [0] * num_denominations
+
+    pos, current_sum = 0, 0
+    while True:
+        if current_sum == target_amount:
+            complete_combination = list(current_combination)
+            for i in range(pos, num_denominations):
+                complete_combination[i] = 0
+            yield {
+                'combination': _caller_order(complete_combination, instance.order),
+                'sum': current_sum
+            }
+        elif current_sum < target_amount and pos < num_denominations:
+            remaining = target_amount - current_sum
+            if not prune:
+                max_count = limits[pos]
+            elif _cut_status(instance, pos, remaining) < 0:
+                max_count = min(limits[pos], remaining // denominations[pos])
+            else:
+                max_count = -1
+
+            if max_count >= 0:
+                current_combination[pos] = 0
+                level_sums[pos] = current_sum
+                level_max_counts[pos] = max_count
+                pos += 1
+                continue
+
+        pos -= 1
+        while pos >= 0 and current_combination[pos] == level_max_counts[pos]:
+            pos -= 1
+        if pos < 0:
+            return
+        current_combination[pos] += 1
+        current_sum = level_sums[pos] + current_combination[pos] * denominations[pos]
+        pos += 1
@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Optional, TextIO
+
+from .backtraking import backtrack_cambio_exacto
+from .cache import ResultCache
+from .knapsack import menos_monedas
+
+
+def leer_casos(lines: Iterable[str], source: str = "<casos>") -> Iterator[Dict[str, Any]]:
+    """
+    Lee casos en el formato de attachments/casos_cambio_exacto.txt:
+    una línea de comentario opcional (# Caso ...) y cuatro líneas con la
+    cantidad de denominaciones, las denominaciones, los límites y el objetivo.
+    Genera los casos uno a uno, sin cargar el archivo completo.
+    """
+    name = None
+    fields = []
+    for number, raw in enumerate(lines, start=1):
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith('#'):
+            if fields:
+                raise ValueError(f"{source}:{number}: caso incompleto antes del comentario")
+            name = line.lstrip('#').strip()
+            continue
+        try:
+            fields.append(list(map(int, line.split())))
+        except ValueError:
+            raise ValueError(f"{source}:{number}: se esperaban enteros: {line!r}") from None
+        if len(fields) < 4:
+            continue
+
+        count_line, denominations, limits, target_line = fields
+        if len(count_line) != 1 or len(target_line) != 1:
+            raise ValueError(f"{source}:{number}: la cantidad y el objetivo deben ser un solo entero")
+        count, target = count_line[0], target_line[0]
+        if len(denominations) != count or len(limits) != count:
+            raise ValueError(f"{source}:{number}: se esperaban {count} denominaciones y límites")
+        if any(denom <= 0 for denom in denominations):
+            raise ValueError(f"{source}:{number}: las denominaciones deben ser positivas")
+        yield {
+            'name': name,
+            'denominations': denominations,
+            'limits': limits,
+            'target': target
+        }
+        name = None
+        fields = []
+
+    if fields:
+        raise ValueError(f"{source}: caso incompleto al final del archivo")
+
+
+def leer_archivos(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Encadena los casos de varios archivos, agregando su origen."""
+    for path in paths:
+        with open(path, encoding='utf-8') as file:
+            for case in leer_casos(file, source=str(path)):
+                case['source'] = str(path)
+                yield case
+
+
+def resolver_caso(case: Dict[str, Any], cache: Optional[ResultCache] = None) -> Dict[str, Any]:
+    """
+    Resuelve un caso y resume el resultado en un registro JSON.
+    Con cache, los casos ya resueltos no se buscan de nuevo y su 'steps' es None.
+    """
+    start = time.perf_counter()
+    solutions = cache.get_solutions(case['denominations'], case['limits'], case['target']) if cache else None
+    steps = None
+    if solutions is None:
+        result = backtrack_cambio_exacto(case['denominations'], case['limits'], case['target'], trace='counters')
+        solutions = result['solutions']
+        steps = len(result['steps'])
+        if cache:
+            cache.put_solutions(case['denominations'], case['limits'], case['target'], solutions)
+    best = menos_monedas(solutions)
+    return {
+        **case,
+        'solutions': len(solutions),
+        'best': best['combination'] if best else None,
+        'best_coins': sum(best['combination']) if best else None,
+        'steps': steps,
+        'wall_time': time.perf_counter() - start
+    }
+
+
+def resolver_lote(cases: List[Dict[str, Any]], cache_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    cache = ResultCache(cache_path) if cache_path else None
+    try:
+        return [resolver_caso(case, cache) for case in cases]
+    finally:
+        if cache:
+            cache.close()
+
+
+def run_batch(
+    cases: Iterable[Dict[str, Any]],
+    output: TextIO,
+    workers: Optional[int] = None,
+    window: Optional[int] = None,
+    chunk_size: int = 64,
+    cache_path: Optional[str] = None
+) -> int:
+    """
+    Resuelve los casos en un ProcessPoolExecutor y escribe un registro JSON
+    por línea, en el orden de entrada. Los casos viajan en lotes de
+    chunk_size y como mucho hay window lotes en vuelo, así que la memoria no
+    depende del tamaño del archivo. Con cache_path los procesos comparten
+    la caché de resultados en esa base SQLite.
+    Devuelve la cantidad de casos resueltos.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = window or 4 * workers
+    cases = iter(cases)
+    written = 0
+
+    def _write(future) -> int:
+        records = future.result()
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return len(records)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        while chunk := list(islice(cases, chunk_size)):
+            pending.append(pool.submit(resolver_lote, chunk, cache_path))
+            if len(pending) >= window:
+                written += _write(pending.popleft())
+        while pending:
+            written += _write(pending.popleft())
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resuelve en lote archivos de casos de cambio exacto.")
+    parser.add_argument('files', nargs='+', type=Path, help='Archivos con el formato de casos_cambio_exacto.txt')
+    parser.add_argument('--output', '-o', type=Path, help='Archivo JSON Lines de salida (por defecto, la salida estándar)')
+    parser.add_argument('--workers', type=int, help='Procesos del pool (por defecto, uno por núcleo)')
+    parser.add_argument('--window', type=int, help='Lotes en vuelo como máximo')
+    parser.add_argument('--chunk-size', type=int, default=64, help='Casos por lote enviado a cada proceso')
+    parser.add_argument('--cache', type=Path, help='Base SQLite de la caché de resultados compartida')
+    args = parser.parse_args()
+
+    cases = leer_archivos(args.files)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            total = run_batch(cases, out, args.workers, args.window, args.chunk_size, args.cache)
+    else:
+        total = run_batch(cases, sys.stdout, args.workers, args.window, args.chunk_size, args.cache)
+    print(f"{total} casos resueltos", file=sys.stderr)
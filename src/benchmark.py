@@ -0,0 +1,247 @@
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+
+from .backtraking import backtrack_cambio_exacto
+from .knapsack import contar_soluciones, dp_cambio_minimo
+from .memo import MemoCache
+from .parallel import backtrack_cambio_exacto_paralelo
+from .step_trace import EXPLORANDO, StepTrace
+
+
+Instance = Tuple[List[int], List[int], int]
+
+
+def instancia_aleatoria(rng: random.Random, size: int, limit: int) -> Instance:
+    """Denominaciones y límites al azar, objetivo cerca de la mitad de la suma máxima."""
+    denominations = sorted(rng.sample(range(1, 10 * size + 1), size))
+    limits = [rng.randint(1, limit) for _ in range(size)]
+    max_sum = sum(d * l for d, l in zip(denominations, limits))
+    return denominations, limits, rng.randint(max_sum // 3, max_sum // 2)
+
+
+def instancia_muchas_soluciones(rng: random.Random, size: int, limit: int) -> Instance:
+    """Monedas pequeñas y consecutivas con límites altos: muchísimas soluciones."""
+    denominations = list(range(1, size + 1))
+    limits = [limit] * size
+    return denominations, limits, size * limit // 2 + rng.randint(0, size)
+
+
+def instancia_ramas_muertas(rng: random.Random, size: int, limit: int) -> Instance:
+    """
+    Múltiplos de una base k y, al final, k-2 monedas de 1 que no alcanzan a
+    cubrir el residuo k-1 del objetivo: no hay ninguna solución. Como el mcd
+    es 1 la poda por mcd nunca corta, pero la de suma máxima sí descarta
+    los prefijos con resto mayor que k-2 en el último nivel (en n=4 se
+    exploran 67 nodos con podas y 330 sin ellas, con 245 ramas muertas).
+    La tabla de alcanzables lo detecta desde la raíz.
+    """
+    base = rng.randint(5, 9)
+    denominations = [base * i for i in range(1, size)] + [1]
+    limits = [limit] * (size - 1) + [base - 2]
+    max_sum = sum(d * l for d, l in zip(denominations, limits))
+    target = (max_sum // 2) // base * base + base - 1
+    return denominations, limits, target
+
+
+def instancia_profunda(rng: random.Random, size: int, limit: int) -> Instance:
+    """Muchas denominaciones con límite 1: árbol profundo y estrecho."""
+    num_denominations = size * 4
+    denominations = [rng.randint(1, 50) for _ in range(num_denominations)]
+    limits = [1] * num_denominations
+    return denominations, limits, sum(denominations) // 10
+
+
+FAMILIES: Dict[str, Callable[[random.Random, int, int], Instance]] = {
+    'aleatoria': instancia_aleatoria,
+    'muchas_soluciones': instancia_muchas_soluciones,
+    'ramas_muertas': instancia_ramas_muertas,
+    'profunda': instancia_profunda,
+}
+
+
+def _explored(steps) -> int:
+    counters = steps.counters() if isinstance(steps, StepTrace) else steps
+    return counters.by_status[EXPLORANDO]
+
+
+def _search_summary(result: Dict[str, Any]) -> Dict[str, Any]:
+    steps = result['steps']
+    return {
+        'solutions': len(result['solutions']),
+        'nodes': _explored(steps),
+        'trace_bytes': steps.nbytes if isinstance(steps, StepTrace) else 0,
+    }
+
+
+class Engine:
+    """
+    Motor a medir: run(instance) hace el cálculo, que es lo único que se
+    cronometra, y summary(resultado) lo resume después (nodos, tamaño de la
+    traza). session() abre los recursos que comparten todas las corridas de
+    una medición y devuelve la función a cronometrar.
+    """
+
+    def __init__(self, run: Callable[[Instance], Any], summary: Callable[[Any], Dict[str, Any]]):
+        self.run = run
+        self.summary = summary
+
+    @contextmanager
+    def session(self) -> Iterator[Callable[[Instance], Any]]:
+        yield self.run
+
+
+class ParallelEngine(Engine):
+    """Motor paralelo: un mismo pool de procesos para todas las corridas."""
+
+    def __init__(self, **options):
+        super().__init__(self._run, _search_summary)
+        self.options = options
+
+    def _run(self, instance: Instance, executor: Optional[Executor] = None) -> Dict[str, Any]:
+        return backtrack_cambio_exacto_paralelo(*instance, executor=executor, **self.options)
+
+    @contextmanager
+    def session(self) -> Iterator[Callable[[Instance], Any]]:
+        with ProcessPoolExecutor() as executor:
+            yield lambda instance: self._run(instance, executor)
+
+
+def _backtracking(**options) -> Engine:
+    return Engine(lambda instance: backtrack_cambio_exacto(*instance, **options), _search_summary)
+
+
+def _memo(instance: Instance) -> Dict[str, Any]:
+    return backtrack_cambio_exacto(*instance, trace='counters', memo=MemoCache())
+
+
+ENGINES: Dict[str, Engine] = {
+    'backtracking': _backtracking(trace='full'),
+    'backtracking_contadores': _backtracking(trace='counters'),
+    'backtracking_sin_poda': _backtracking(trace='counters', prune=False),
+    'backtracking_desc': _backtracking(trace='counters', order='desc'),
+    'backtracking_alcance': _backtracking(trace='counters', reachability=True),
+    'backtracking_memo': Engine(_memo, _search_summary),
+    'paralelo': ParallelEngine(),
+    'dp_minimo': Engine(
+        lambda instance: dp_cambio_minimo(*instance),
+        lambda best: {'solutions': int(best is not None), 'nodes': 0, 'trace_bytes': 0}
+    ),
+    'dp_conteo': Engine(
+        lambda instance: contar_soluciones(*instance),
+        lambda count: {'solutions': count, 'nodes': 0, 'trace_bytes': 0}
+    ),
+}
+
+
+def medir(engine: Engine, instance: Instance, repeat: int) -> Dict[str, Any]:
+    """Mejor tiempo de repeat corridas, memoria pico (tracemalloc) y tamaño de la traza."""
+    best = float('inf')
+    with engine.session() as run:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run(instance)
+            best = min(best, time.perf_counter() - start)
+        summary = engine.summary(result)
+        del result
+
+        tracemalloc.start()
+        try:
+            run(instance)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        **summary,
+        'seconds': best,
+        'nodes_per_second': summary['nodes'] / best if best > 0 else None,
+        'peak_bytes': peak,
+    }
+
+
+def run_benchmarks(
+    families: List[str],
+    engines: List[str],
+    sizes: List[int],
+    limit: int,
+    seed: int,
+    repeat: int
+) -> Dict[str, Any]:
+    """Corre cada motor sobre cada familia y tamaño con instancias reproducibles."""
+    results = []
+    for family in families:
+        for size in sizes:
+            rng = random.Random(f"{seed}:{family}:{size}")
+            instance = FAMILIES[family](rng, size, limit)
+            for engine in engines:
+                measurement = medir(ENGINES[engine], instance, repeat)
+                results.append({
+                    'family': family,
+                    'size': size,
+                    'engine': engine,
+                    'num_denominations': len(instance[0]),
+                    'target': instance[2],
+                    **measurement
+                })
+                print(f"{family:>18} n={size:<3} {engine:<24} {measurement['seconds']:.4f}s", file=sys.stderr)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'limit': limit,
+            'repeat': repeat,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results
+    }
+
+
+def regresiones(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Casos que tardan más que en la referencia por encima de la tolerancia relativa."""
+    reference = {(r['family'], r['size'], r['engine']): r['seconds'] for r in baseline['results']}
+    found = []
+    for result in report['results']:
+        previous = reference.get((result['family'], result['size'], result['engine']))
+        if previous and result['seconds'] > previous * (1 + tolerance):
+            found.append(
+                f"{result['family']} n={result['size']} {result['engine']}: "
+                f"{previous:.4f}s -> {result['seconds']:.4f}s"
+            )
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de los motores de cambio exacto.")
+    parser.add_argument('--families', nargs='+', default=list(FAMILIES), choices=list(FAMILIES))
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[3, 4, 5], help='Cantidad de denominaciones por familia')
+    parser.add_argument('--limit', type=int, default=8, help='Límite máximo por denominación')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', '-o', type=Path, help='Reporte JSON (por defecto, la salida estándar)')
+    parser.add_argument('--baseline', type=Path, help='Reporte anterior para detectar regresiones')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Tolerancia relativa de tiempo')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.families, args.engines, args.sizes, args.limit, args.seed, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding='utf-8')
+    else:
+        print(text)
+
+    if args.baseline:
+        found = regresiones(report, json.loads(args.baseline.read_text(encoding='utf-8')), args.tolerance)
+        for line in found:
+            print(f"Regresión: {line}", file=sys.stderr)
+        sys.exit(1 if found else 0)
@@ -0,0 +1,282 @@
+import os
+import time
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from itertools import product
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'cambio_exacto' / 'resultados.sqlite'
+
+
+def canonical_instance(denominations: List[int], limits: List[int]) -> Tuple[Tuple[int, ...], Tuple[int, ...], List[int]]:
+    """
+    Forma canónica de una instancia: denominaciones ordenadas y sin repetir,
+    sumando los límites de las repetidas. Devuelve también, para cada
+    posición original, su posición en la forma canónica.
+    """
+    if len(denominations) != len(limits):
+        raise ValueError("La cantidad de denominaciones y límites debe ser igual.")
+    merged: Dict[int, int] = {}
+    for denom, limit in zip(denominations, limits):
+        merged[denom] = merged.get(denom, 0) + limit
+    canonical_denominations = tuple(sorted(merged))
+    index = {denom: pos for pos, denom in enumerate(canonical_denominations)}
+    return (
+        canonical_denominations,
+        tuple(merged[denom] for denom in canonical_denominations),
+        [index[denom] for denom in denominations]
+    )
+
+
+def _splits(total: int, limits: List[int]):
+    """Formas de repartir total monedas entre posiciones con esos límites."""
+    if len(limits) == 1:
+        if total <= limits[0]:
+            yield (total,)
+        return
+    for first in range(min(total, limits[0]) + 1):
+        for rest in _splits(total - first, limits[1:]):
+            yield (first,) + rest
+
+
+def to_canonical(solutions: List[Dict[str, Any]], mapping: List[int], size: int) -> List[Tuple[int, ...]]:
+    """Combinaciones canónicas (sin repetir y ordenadas) de unas soluciones."""
+    canonical = set()
+    for solution in solutions:
+        combination = [0] * size
+        for original, count in enumerate(solution['combination']):
+            combination[mapping[original]] += count
+        canonical.add(tuple(combination))
+    return sorted(canonical)
+
+
+def from_canonical(
+    combinations: List[Tuple[int, ...]],
+    denominations: List[int],
+    limits: List[int],
+    mapping: List[int],
+    target_amount: int
+) -> List[Dict[str, Any]]:
+    """
+    Soluciones en el orden de la instancia original: las cantidades de una
+    denominación repetida se reparten de todas las formas posibles entre sus
+    posiciones, y el resultado queda en orden lexicográfico, que es el orden
+    en que las encuentra backtrack_cambio_exacto.
+    """
+    positions: Dict[int, List[int]] = {}
+    for original, canonical in enumerate(mapping):
+        positions.setdefault(canonical, []).append(original)
+
+    expanded = []
+    for combination in combinations:
+        choices = [
+            list(_splits(count, [limits[original] for original in positions[canonical]]))
+            for canonical, count in enumerate(combination)
+        ]
+        for split in product(*choices):
+            original_combination = [0] * len(denominations)
+            for canonical, counts in enumerate(split):
+                for original, count in zip(positions[canonical], counts):
+                    original_combination[original] = count
+            expanded.append(original_combination)
+    expanded.sort()
+    return [{'combination': combination, 'sum': target_amount} for combination in expanded]
+
+
+class ResultCache:
+    """
+    Caché de resultados en dos niveles: un LRU en memoria y una base SQLite
+    en disco, ambos con límite de tamaño en bytes (se expulsan primero las
+    entradas usadas hace más tiempo). Los valores se guardan con pickle, así
+    que la base es solo para uso local.
+    Las soluciones se guardan por instancia canónica (varias entradas
+    equivalentes comparten la entrada) y las trazas completas por instancia
+    exacta, porque dependen del orden de las denominaciones.
+    Varios procesos (la aplicación, el visualizador, el lote) pueden usar la
+    misma base a la vez.
+    """
+
+    TOUCH_BATCH = 64    # Usos del disco que se acumulan antes de escribirlos
+
+    def __init__(
+        self,
+        path: Optional[os.PathLike] = DEFAULT_CACHE_PATH,
+        memory_bytes: int = 32 * 1024 * 1024,
+        disk_bytes: int = 256 * 1024 * 1024
+    ):
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._memory: OrderedDict = OrderedDict()   # clave -> (valor, bytes)
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._touched: Dict[str, float] = {}    # Últimos usos del disco aún sin escribir
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), timeout=30, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('BEGIN IMMEDIATE')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS resultados ('
+                ' clave TEXT PRIMARY KEY, valor BLOB NOT NULL,'
+                ' bytes INTEGER NOT NULL, usado REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS resultados_usado ON resultados (usado)')
+            # Total de bytes en una tabla de una fila, compartida entre procesos:
+            # cada escritura lo ajusta y solo se desaloja al pasar el límite
+            self._db.execute('CREATE TABLE IF NOT EXISTS uso (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)')
+            self._db.execute('INSERT OR IGNORE INTO uso VALUES (0, (SELECT COALESCE(SUM(bytes), 0) FROM resultados))')
+            self._db.execute('COMMIT')
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        """Valor guardado para key, o None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key][0]
+            if self._db is not None:
+                row = self._db.execute('SELECT valor FROM resultados WHERE clave = ?', (key,)).fetchone()
+                if row is not None:
+                    self._touched[key] = time.time()
+                    if len(self._touched) >= self.TOUCH_BATCH:
+                        self._db.execute('BEGIN IMMEDIATE')
+                        self._flush_touched()
+                        self._db.execute('COMMIT')
+                    value = pickle.loads(row[0])
+                    self._remember(key, value, len(row[0]))
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, value, len(blob))
+            if self._db is not None and len(blob) <= self.disk_bytes:
+                self._db.execute('BEGIN IMMEDIATE')
+                try:
+                    self._flush_touched()
+                    previous = self._db.execute('SELECT bytes FROM resultados WHERE clave = ?', (key,)).fetchone()
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO resultados (clave, valor, bytes, usado) VALUES (?, ?, ?, ?)',
+                        (key, blob, len(blob), time.time())
+                    )
+                    self._db.execute('UPDATE uso SET bytes = bytes + ? WHERE id = 0', (len(blob) - (previous[0] if previous else 0),))
+                    self._evict_disk()
+                except BaseException:
+                    self._db.execute('ROLLBACK')
+                    raise
+                self._db.execute('COMMIT')
+
+    def _flush_touched(self) -> None:
+        """Escribe los usos pendientes (dentro de una transacción abierta)."""
+        if self._touched:
+            self._db.executemany(
+                'UPDATE resultados SET usado = ? WHERE clave = ?',
+                [(used, key) for key, used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _remember(self, key: str, value, size: int) -> None:
+        if key in self._memory:
+            self._memory_used -= self._memory.pop(key)[1]
+        if size > self.memory_bytes:
+            return
+        self._memory[key] = (value, size)
+        self._memory_used += size
+        while self._memory_used > self.memory_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_used -= evicted
+
+    def _evict_disk(self) -> None:
+        """Desaloja lo menos usado hasta volver al límite (dentro de una transacción abierta)."""
+        used = self._db.execute('SELECT bytes FROM uso WHERE id = 0').fetchone()[0]
+        if used <= self.disk_bytes:
+            return
+        freed = 0
+        while used - freed > self.disk_bytes:
+            oldest = self._db.execute('SELECT clave, bytes FROM resultados ORDER BY usado LIMIT 64').fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                self._db.execute('DELETE FROM resultados WHERE clave = ?', (key,))
+                freed += size
+                if used - freed <= self.disk_bytes:
+                    break
+        self._db.execute('UPDATE uso SET bytes = bytes - ? WHERE id = 0', (freed,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+            self._touched.clear()
+            if self._db is not None:
+                self._db.execute('BEGIN IMMEDIATE')
+                self._db.execute('DELETE FROM resultados')
+                self._db.execute('UPDATE uso SET bytes = 0 WHERE id = 0')
+                self._db.execute('COMMIT')
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None and self._touched:
+                self._db.execute('BEGIN IMMEDIATE')
+                self._flush_touched()
+                self._db.execute('COMMIT')
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    # Soluciones por instancia canónica
+
+    def get_solutions(self, denominations: List[int], limits: List[int], target_amount: int) -> Optional[List[Dict[str, Any]]]:
+        """Todas las soluciones de la instancia, en el orden del backtracking, o None."""
+        canonical_denominations, canonical_limits, mapping = canonical_instance(denominations, limits)
+        combinations = self.get(f"soluciones:{canonical_denominations}:{canonical_limits}:{target_amount}")
+        if combinations is None:
+            return None
+        return from_canonical(combinations, denominations, limits, mapping, target_amount)
+
+    def put_solutions(
+        self,
+        denominations: List[int],
+        limits: List[int],
+        target_amount: int,
+        solutions: List[Dict[str, Any]]
+    ) -> None:
+        """Guarda la lista completa de soluciones (nunca una parcial)."""
+        canonical_denominations, canonical_limits, mapping = canonical_instance(denominations, limits)
+        self.put(
+            f"soluciones:{canonical_denominations}:{canonical_limits}:{target_amount}",
+            to_canonical(solutions, mapping, len(canonical_denominations))
+        )
+
+    # Trazas completas por instancia exacta
+
+    def get_trace(self, denominations: List[int], limits: List[int], target_amount: int) -> Optional[Dict[str, Any]]:
+        """Resultado de backtrack_cambio_exacto con trace='full', o None."""
+        return self.get(f"traza:{tuple(denominations)}:{tuple(limits)}:{target_amount}")
+
+    def put_trace(self, denominations: List[int], limits: List[int], target_amount: int, result: Dict[str, Any]) -> None:
+        self.put(f"traza:{tuple(denominations)}:{tuple(limits)}:{target_amount}", result)
+
+
+_default_cache: Optional[ResultCache] = None
+
+
+def default_cache() -> ResultCache:
+    """
+    Caché compartida por la aplicación, el visualizador y el lote. La ruta
+    se puede cambiar con la variable de entorno CAMBIO_EXACTO_CACHE.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache(os.environ.get('CAMBIO_EXACTO_CACHE', DEFAULT_CACHE_PATH))
+    return _default_cache
@@ -0,0 +1,54 @@
+import sys
+import json
+import argparse
+from typing import List, Optional
+
+from .solver import resolver
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada del comando cambio-exacto: resuelve una instancia dada
+    por opciones (o los casos de uno o más archivos) e imprime JSON. Solo
+    importa el núcleo del solver, así que arranca sin cargar la GUI ni la
+    pila de gráficos.
+    """
+    parser = argparse.ArgumentParser(
+        prog='cambio-exacto',
+        description="Resuelve instancias del problema de cambio exacto e imprime el resultado en JSON."
+    )
+    parser.add_argument('files', nargs='*', help='Archivos de casos (un registro JSON por línea en la salida)')
+    parser.add_argument('--denominations', '-d', nargs='+', type=int, help='Lista de denominaciones (ej: 1 3)')
+    parser.add_argument('--limits', '-l', nargs='+', type=int, help='Lista de límites para cada denominación (ej: 2 3)')
+    parser.add_argument('--target', '-t', type=int, help='Cantidad objetivo (ej: 6)')
+    parser.add_argument('--max-nodes', type=int, help='Detener la búsqueda tras explorar esta cantidad de nodos')
+    parser.add_argument('--time-limit', type=float, help='Detener la búsqueda tras estos segundos')
+    parser.add_argument('--no-solutions', action='store_true', help='Omitir la lista de soluciones (solo la cantidad)')
+    parser.add_argument('--indent', type=int, help='Sangría del JSON de una instancia')
+    args = parser.parse_args(argv)
+
+    options = {
+        'max_nodes': args.max_nodes,
+        'time_limit': args.time_limit,
+        'include_solutions': not args.no_solutions,
+    }
+    if args.files:
+        from .batch import leer_archivos
+        for case in leer_archivos(args.files):
+            record = resolver(case['denominations'], case['limits'], case['target'], **options)
+            record = {'name': case['name'], 'source': case['source'], **record}
+            print(json.dumps(record, ensure_ascii=False))
+        return 0
+
+    if args.denominations is None or args.limits is None or args.target is None:
+        parser.error("se requieren --denominations, --limits y --target (o archivos de casos)")
+    try:
+        record = resolver(args.denominations, args.limits, args.target, **options)
+    except ValueError as error:
+        parser.error(str(error))
+    print(json.dumps(record, ensure_ascii=False, indent=args.indent))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,19 @@
-import subprocess
+import os
+import time
+import tempfile
+import threading
 from pathlib import Path
 
 import flet as ft
 
 from .create_coin import create_coin
 from .backtraking import backtrack_cambio_exacto
+from .cache import default_cache
+from .hooks import SearchBudget
+from .knapsack import dp_viable, top_k_de_soluciones, top_k_soluciones
+from .solution_pager import SolutionPager, SORT_FOUND, SORT_FEWEST, SORT_MOST
+from .trace_file import write_trace
+from .viz_worker import VisualizerWorker
 
 
 class CambioExactoApp:
@@ -17,10 +26,29 @@ class CambioExactoApp:
         self.solutions = []
         self.min_coins_solution = None
         self.min_coins_count = float('inf')
+        self.top_solutions = []
+        self.top_partial = False        # Ranking solo entre soluciones de una búsqueda detenida
+        self.top_k = 5
         
         # Componentes para visualización del árbol
         self.current_path = []
         self.step_counter = 0
+
+        # Búsqueda en segundo plano: cada búsqueda nueva cancela la anterior
+        self.search_id = 0
+        self.search_cancel = None
+        self.progress_interval = 0.2
+        self.result_cache = default_cache()
+
+        # Traza de la última búsqueda completa, para el visualizador
+        self.trace_path = None
+        self.trace_instance = None
+        self.visualizer = None          # Proceso visualizador, se inicia al primer uso
+
+        # Vista paginada de soluciones
+        self.solution_pager = None
+        self.solutions_page = 0
+        self.solutions_page_size = 24
         
         # Componentes de la UI
         self.denominations_input = None
@@ -32,6 +60,15 @@ class CambioExactoApp:
         self.step_counter_text = None
         self.animation_controls = None
         self.coins_display = None
+        self.max_nodes_input = None
+        self.time_limit_input = None
+        self.cancel_button = None
+        self.sort_dropdown = None
+        self.min_coins_filter = None
+        self.max_coins_filter = None
+        self.page_label = None
+        self.prev_page_button = None
+        self.next_page_button = None
 
     def update_coins_display(self):
         """Actualiza la visualización de las monedas disponibles."""
@@ -54,10 +91,73 @@ class CambioExactoApp:
         self.coins_display.content = coins_row
         self.page.update()
 
+    def solution_card(self, number, sol):
+        """Tarjeta de una solución con sus monedas."""
+        solution_coins = ft.Row(
+            controls=[],
+            alignment=ft.MainAxisAlignment.CENTER,
+            wrap=True,
+        )
+        for i, count in enumerate(sol['combination']):
+            if count > 0:
+                solution_coins.controls.append(
+                    create_coin(self.denominations[i], count, True)
+                )
+        return ft.Card(
+            content=ft.Container(
+                content=ft.Column([
+                    ft.Text(f"Solución {number}", weight=ft.FontWeight.BOLD),
+                    solution_coins,
+                    ft.Text(f"Total: {sol['sum']}", size=14),
+                    ft.Text(f"Monedas usadas: {sum(sol['combination'])}", size=12),
+                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, scroll=ft.ScrollMode.AUTO),
+                padding=ft.padding.all(15),
+            ),
+            margin=ft.margin.symmetric(vertical=5, horizontal=5),
+        )
+
     def update_solutions_display(self):
-        """Actualiza la visualización de las soluciones."""
+        """Prepara la vista paginada de las soluciones y muestra la primera página."""
+        solutions = self.solutions
+        self.solution_pager = SolutionPager(
+            lambda: iter(solutions),
+            page_size=self.solutions_page_size,
+            sort=self.sort_dropdown.value or SORT_FOUND,
+            min_coins=self.coin_filter(self.min_coins_filter),
+            max_coins=self.coin_filter(self.max_coins_filter),
+        )
+        self.solutions_page = 0
+        self.show_solutions_page()
+
+    def coin_filter(self, field):
+        """Valor entero de un filtro de monedas; si no es válido se ignora y se marca el campo."""
+        value = field.value.strip()
+        field.error_text = None
+        if not value:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            field.error_text = "Debe ser un entero"
+            return None
+
+    def show_error(self, message):
+        """Reemplaza el contenido de las soluciones por un mensaje de error."""
+        self.solutions_container.controls.clear()
+        self.solutions_container.controls.append(
+            ft.Container(
+                content=ft.Text(message, size=16, color=ft.Colors.RED_500, text_align=ft.TextAlign.CENTER),
+                alignment=ft.alignment.center,
+                padding=ft.padding.all(20),
+            )
+        )
+        self.page.update()
+
+    def show_solutions_page(self):
+        """Crea controles solo para las soluciones de la página actual."""
         self.solutions_container.controls.clear()
-        if not self.solutions:
+        page_solutions = self.solution_pager.page(self.solutions_page)
+        if not page_solutions:
             self.solutions_container.controls.append(
                 ft.Container(
                     content=ft.Text(
@@ -70,31 +170,33 @@ class CambioExactoApp:
                     padding=ft.padding.all(20),
                 )
             )
-        else:
-            for idx, sol in enumerate(self.solutions):
-                solution_coins = ft.Row(
-                    controls=[],
-                    alignment=ft.MainAxisAlignment.CENTER,
-                    wrap=True,
-                )
-                for i, count in enumerate(sol['combination']):
-                    if count > 0:
-                        solution_coins.controls.append(
-                            create_coin(self.denominations[i], count, True)
-                        )
-                solution_card = ft.Card(
-                    content=ft.Container(
-                        content=ft.Column([
-                            ft.Text(f"Solución {idx + 1}", weight=ft.FontWeight.BOLD),
-                            solution_coins,
-                            ft.Text(f"Total: {sol['sum']}", size=14),
-                            ft.Text(f"Monedas usadas: {sum(sol['combination'])}", size=12),
-                        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                        padding=ft.padding.all(15),
-                    ),
-                    margin=ft.margin.symmetric(vertical=5, horizontal=5),
-                )
-                self.solutions_container.controls.append(solution_card)
+        for number, sol in page_solutions:
+            self.solutions_container.controls.append(self.solution_card(number, sol))
+
+        has_next = self.solution_pager.has_next(self.solutions_page)
+        total = self.solution_pager.total
+        self.page_label.value = f"Página {self.solutions_page + 1}" + (
+            f" de {max(1, -(-total // self.solutions_page_size))} ({total} soluciones)" if total is not None else ""
+        )
+        self.prev_page_button.disabled = self.solutions_page == 0
+        self.next_page_button.disabled = not has_next
+
+    def change_solutions_view(self, e):
+        """Aplica el orden y el filtro elegidos."""
+        self.update_solutions_display()
+        self.page.update()
+
+    def previous_solutions_page(self, e):
+        if self.solutions_page > 0:
+            self.solutions_page -= 1
+            self.show_solutions_page()
+            self.page.update()
+
+    def next_solutions_page(self, e):
+        if self.solution_pager.has_next(self.solutions_page):
+            self.solutions_page += 1
+            self.show_solutions_page()
+            self.page.update()
 
     def update_best_solution_display(self):
         """Actualiza la visualización de la mejor solución."""
@@ -114,7 +216,7 @@ class CambioExactoApp:
                 content=ft.Container(
                     content=ft.Column([
                         ft.Text(
-                            "🏆 Mejor solución",
+                            "🏆 Mejor solución encontrada (parcial)" if self.top_partial else "🏆 Mejor solución",
                             size=20,
                             weight=ft.FontWeight.BOLD,
                             color=ft.Colors.AMBER_700,
@@ -127,7 +229,8 @@ class CambioExactoApp:
                             weight=ft.FontWeight.BOLD,
                         ),
                         ft.Text(
-                            f"Monedas mínimas: {self.min_coins_count}",
+                            f"Monedas: {self.min_coins_count} (la búsqueda se detuvo; puede haber una mejor)"
+                            if self.top_partial else f"Monedas mínimas: {self.min_coins_count}",
                             size=14,
                             color=ft.Colors.GREEN_600,
                         ),
@@ -138,12 +241,32 @@ class CambioExactoApp:
             )
             self.best_solution_container.controls.append(best_card)
 
+        if len(self.top_solutions) > 1:
+            ranking = ft.Column([
+                ft.Text(
+                    f"Top {len(self.top_solutions)} por cantidad de monedas"
+                    + (" (entre las soluciones encontradas)" if self.top_partial else ""),
+                    size=16, weight=ft.FontWeight.BOLD,
+                ),
+            ], spacing=4)
+            for rank, sol in enumerate(self.top_solutions, start=1):
+                coins = " + ".join(
+                    f"{count}×{self.denominations[i]}"
+                    for i, count in enumerate(sol['combination']) if count > 0
+                )
+                ranking.controls.append(ft.Text(f"#{rank}: {sol['cost']} monedas — {coins}", size=14))
+            self.best_solution_container.controls.append(
+                ft.Card(content=ft.Container(content=ranking, padding=ft.padding.all(15)))
+            )
+
     def process_input(self, e):
         """Procesa la entrada y ejecuta el algoritmo."""
         # Limpiar resultados anteriores
         self.solutions.clear()
         self.min_coins_solution = None
         self.min_coins_count = float('inf')
+        self.top_solutions = []
+        self.top_partial = False
         self.current_path.clear()
         self.step_counter = 0
         # Limpiar displays
@@ -151,9 +274,21 @@ class CambioExactoApp:
         self.best_solution_container.controls.clear()
         self.step_counter_text.value = "Pasos: 0"
         
-        self.denominations = list(map(int, self.denominations_input.value.split()))
-        self.limits = list(map(int, self.limits_input.value.split()))
-        self.target_amount = int(self.target_input.value)
+        try:
+            denominations = list(map(int, self.denominations_input.value.split()))
+            limits = list(map(int, self.limits_input.value.split()))
+            target_amount = int(self.target_input.value)
+            max_nodes = int(self.max_nodes_input.value) if self.max_nodes_input.value.strip() else None
+            time_limit = float(self.time_limit_input.value) if self.time_limit_input.value.strip() else None
+        except ValueError:
+            self.show_error("Datos inválidos: se esperaban números enteros separados por espacios.")
+            return
+        if len(denominations) != len(limits):
+            self.show_error("La cantidad de denominaciones y límites debe ser igual.")
+            return
+        self.denominations = denominations
+        self.limits = limits
+        self.target_amount = target_amount
 
         # lanzar_visualizador()
 
@@ -173,31 +308,125 @@ class CambioExactoApp:
                 padding=ft.padding.all(20),
             )
         )
+
+        # Cancelar la búsqueda anterior y lanzar la nueva en segundo plano
+        if self.search_cancel is not None:
+            self.search_cancel.set()
+        self.search_id += 1
+        self.search_cancel = threading.Event()
+        self.cancel_button.disabled = False
         self.page.update()
+        # El hilo recibe su propia copia de la instancia: self.denominations y
+        # compañía cambian con el próximo clic aunque esta búsqueda siga
+        instance = (list(self.denominations), list(self.limits), self.target_amount)
+        threading.Thread(
+            target=self.run_search,
+            args=(self.search_id, self.search_cancel, instance, max_nodes, time_limit),
+            daemon=True,
+        ).start()
+
+    def run_search(self, search_id, cancel, instance, max_nodes, time_limit):
+        """
+        Cuerpo del hilo de búsqueda: si algo falla, muestra el error y deja
+        la interfaz lista para otra búsqueda en lugar de morir en silencio.
+        """
+        try:
+            self.search_and_display(search_id, cancel, instance, max_nodes, time_limit)
+        except Exception as error:
+            if search_id != self.search_id:
+                return
+            print(f"Error en la búsqueda: {error!r}")
+            self.cancel_button.disabled = True
+            self.search_cancel = None
+            self.show_error(f"Error en la búsqueda: {error}")
+
+    def search_and_display(self, search_id, cancel, instance, max_nodes, time_limit):
+        """
+        Ejecuta el algoritmo e informa el progreso a la página.
+        instance es (denominaciones, límites, objetivo) tal como estaban al
+        lanzar la búsqueda; la caché y la traza se guardan solo con ella.
+        """
+        denominations, limits, target_amount = instance
+        last_report = 0.0
+
+        def report_progress(nodes, solutions):
+            nonlocal last_report
+            now = time.perf_counter()
+            if search_id != self.search_id or now - last_report < self.progress_interval:
+                return
+            last_report = now
+            self.step_counter_text.value = f"Explorando... nodos: {nodes}, soluciones: {solutions}"
+            self.page.update()
 
-        # Ejecutar algoritmo universal
-        result = backtrack_cambio_exacto(self.denominations, self.limits, self.target_amount)
+        budget = SearchBudget(max_nodes=max_nodes, time_limit=time_limit, cancel=cancel, progress=report_progress)
+
+        # Reusar un resultado anterior o ejecutar algoritmo universal
+        cached = self.result_cache.get_solutions(denominations, limits, target_amount)
+        if cached is not None:
+            result = {'solutions': cached, 'steps': None, 'interrupted': None}
+        else:
+            result = backtrack_cambio_exacto(denominations, limits, target_amount, trace='full', hooks=budget)
+            if not result['interrupted']:
+                self.result_cache.put_solutions(denominations, limits, target_amount, result['solutions'])
+        if search_id != self.search_id:
+            return  # Una búsqueda más nueva ya tomó su lugar
+        if result['steps'] is not None and not result['interrupted']:
+            self.save_trace(result['steps'], instance)
         self.solutions = result['solutions']
-        self.step_counter = len(result['steps'])
+        self.step_counter = len(result['steps']) if result['steps'] is not None else 0
 
-        # Buscar mejor solución
-        self.min_coins_count = float('inf')
-        self.min_coins_solution = None
-        for sol in self.solutions:
-            total_coins = sum(sol['combination'])
-            if total_coins < self.min_coins_count:
-                self.min_coins_count = total_coins
-                self.min_coins_solution = sol
+        # Las mejores soluciones salen de las ya enumeradas; si la búsqueda se
+        # detuvo (por presupuesto o cancelación) y las tablas son chicas, la
+        # búsqueda best-first da el ranking exacto sin enumerar todas. Si no,
+        # el ranking es solo entre las soluciones encontradas hasta ahí
+        self.top_partial = False
+        if result['interrupted'] and dp_viable(denominations, target_amount):
+            self.top_solutions = top_k_soluciones(denominations, limits, target_amount, self.top_k)
+        else:
+            self.top_solutions = top_k_de_soluciones(self.solutions, self.top_k)
+            self.top_partial = bool(result['interrupted'])
+        self.min_coins_solution = self.top_solutions[0] if self.top_solutions else None
+        if self.min_coins_solution:
+            self.min_coins_count = sum(self.min_coins_solution['combination'])
+        else:
+            self.min_coins_count = float('inf')
 
         # Actualizar contadores y displays
         self.step_counter_text.value = f"Pasos ejecutados: {self.step_counter}"
+        if result['steps'] is None:
+            self.step_counter_text.value = f"Resultado tomado de la caché ({len(self.solutions)} soluciones)"
+        if result['interrupted']:
+            self.step_counter_text.value += f" (búsqueda detenida: {result['interrupted']}; resultados parciales)"
+        self.cancel_button.disabled = True
+        self.search_cancel = None
         self.update_solutions_display()
         self.update_best_solution_display()
         
         self.page.update()
 
+    def cancel_search(self, e):
+        """Detiene la búsqueda en curso; se muestran las soluciones halladas hasta ahí."""
+        if self.search_cancel is not None:
+            self.search_cancel.set()
+
     def clear_all(self, e):
         """Limpia todos los campos y resultados."""
+        # Cancelar y descartar la búsqueda en curso: con un search_id nuevo su
+        # resultado parcial ya no se dibuja sobre la pantalla limpia
+        self.cancel_search(e)
+        self.search_id += 1
+        self.search_cancel = None
+        self.cancel_button.disabled = True
+        self.solutions = []
+        self.top_solutions = []
+        self.top_partial = False
+        self.min_coins_solution = None
+        self.min_coins_count = float('inf')
+        self.solution_pager = None
+        self.solutions_page = 0
+        self.page_label.value = "Página 1"
+        self.prev_page_button.disabled = True
+        self.next_page_button.disabled = True
         self.denominations_input.value = ""
         self.limits_input.value = ""
         self.target_input.value = ""
@@ -214,24 +443,67 @@ class CambioExactoApp:
         self.target_input.value = "7"
         self.page.update()
 
-    def visualize_backtracking(self, e):
-        """Llama un subproceso para visualizar el backtracking."""
-        python_file = Path(__file__).parent / "network_steps.py"
-        prompt = [
-            "python3",
-            str(python_file),
-            "--denominations", *list(self.denominations_input.value.split()),
-            "--limits", *list(self.limits_input.value.split()),
-            "--target", self.target_input.value.strip()
-        ]
-        print(f"Ejecutando visualizador con comando: {prompt}")
+    def save_trace(self, trace, instance):
+        """Escribe la traza de instance en un archivo .cxtrace nuevo y descarta el anterior."""
+        denominations, limits, target_amount = instance
+        directory = Path(tempfile.gettempdir()) / "cambio_exacto"
+        directory.mkdir(parents=True, exist_ok=True)
+        descriptor, path = tempfile.mkstemp(suffix=".cxtrace", dir=directory)
+        os.close(descriptor)
+        write_trace(path, trace, denominations, limits, target_amount)
+        previous, self.trace_path = self.trace_path, path
+        self.trace_instance = (list(denominations), list(limits), target_amount)
+        if previous is not None:
+            try:
+                os.remove(previous)
+            except OSError:
+                pass    # El visualizador todavía lo tiene abierto
+
+    def trace_matches_input(self):
+        """¿La traza guardada corresponde a los datos que hay en los campos?"""
+        if self.trace_path is None:
+            return False
         try:
-            subprocess.run(prompt, check=True)
-        except subprocess.CalledProcessError as ex:
-            print(f"Error al ejecutar el visualizador: {ex}")
-            self.page.add(ft.Text("Error al ejecutar el visualizador. Ver consola para más detalles."))
-            self.page.update()
+            current = (
+                list(map(int, self.denominations_input.value.split())),
+                list(map(int, self.limits_input.value.split())),
+                int(self.target_input.value),
+            )
+        except ValueError:
+            return False
+        return current == self.trace_instance
 
+    def visualize_backtracking(self, e):
+        """Envía la instancia (o su traza) al proceso visualizador sin bloquear la GUI."""
+        if self.visualizer is None:
+            self.visualizer = VisualizerWorker(on_error=self.visualizer_failed)
+        busy = self.visualizer.busy
+        if self.trace_matches_input():
+            # El visualizador abre la traza ya calculada sin volver a resolver
+            self.visualizer.show_trace(self.trace_path)
+        else:
+            try:
+                denominations = list(map(int, self.denominations_input.value.split()))
+                limits = list(map(int, self.limits_input.value.split()))
+                target_amount = int(self.target_input.value)
+            except ValueError:
+                self.show_visualizer_message("Datos inválidos para el visualizador.")
+                return
+            if len(denominations) != len(limits):
+                self.show_visualizer_message("La cantidad de denominaciones y límites debe ser igual.")
+                return
+            self.visualizer.show_instance(denominations, limits, target_amount)
+        if busy:
+            self.show_visualizer_message("El visualizador se abrirá al cerrar la ventana actual.")
+
+    def visualizer_failed(self, job, message):
+        """Lo llama el hilo lector del visualizador cuando un pedido falla."""
+        print(f"Error en el visualizador: {message}")
+        self.show_visualizer_message(f"Error al ejecutar el visualizador: {message}")
+
+    def show_visualizer_message(self, message):
+        self.page.add(ft.Text(message))
+        self.page.update()
 
     def create_app(self, page: ft.Page):
         self.page = page
@@ -262,6 +534,25 @@ class CambioExactoApp:
             prefix_icon=ft.Icons.RADAR,
         )
 
+        self.max_nodes_input = ft.TextField(
+            label="Máximo de nodos (opcional)",
+            width=220,
+            prefix_icon=ft.Icons.ACCOUNT_TREE_OUTLINED,
+        )
+
+        self.time_limit_input = ft.TextField(
+            label="Tiempo máximo en s (opcional)",
+            width=220,
+            prefix_icon=ft.Icons.TIMER_OUTLINED,
+        )
+
+        self.cancel_button = ft.OutlinedButton(
+            "Cancelar",
+            on_click=self.cancel_search,
+            icon=ft.Icons.STOP_CIRCLE_OUTLINED,
+            disabled=True,
+        )
+
         # Botones de control
         controls_row = ft.Row([
             ft.ElevatedButton(
@@ -271,6 +562,7 @@ class CambioExactoApp:
                 color=ft.Colors.WHITE,
                 icon=ft.Icons.SEARCH,
             ),
+            self.cancel_button,
             ft.ElevatedButton(
                 "Visualizar backtracking",
                 on_click=self.visualize_backtracking,
@@ -297,7 +589,38 @@ class CambioExactoApp:
             padding=ft.padding.all(20),
         )
 
-        self.solutions_container = ft.Row([], wrap=True, scroll=ft.ScrollMode.AUTO)
+        self.solutions_container = ft.GridView(
+            [],
+            height=560,
+            max_extent=300,
+            child_aspect_ratio=1.0,
+            spacing=5,
+            run_spacing=5,
+        )
+        self.sort_dropdown = ft.Dropdown(
+            label="Ordenar",
+            width=220,
+            value=SORT_FOUND,
+            options=[
+                ft.dropdown.Option(SORT_FOUND, "Orden de hallazgo"),
+                ft.dropdown.Option(SORT_FEWEST, "Menos monedas"),
+                ft.dropdown.Option(SORT_MOST, "Más monedas"),
+            ],
+            on_change=self.change_solutions_view,
+        )
+        self.min_coins_filter = ft.TextField(
+            label="Monedas mín.", width=130, on_submit=self.change_solutions_view,
+        )
+        self.max_coins_filter = ft.TextField(
+            label="Monedas máx.", width=130, on_submit=self.change_solutions_view,
+        )
+        self.page_label = ft.Text("Página 1", size=14)
+        self.prev_page_button = ft.IconButton(
+            ft.Icons.CHEVRON_LEFT, on_click=self.previous_solutions_page, disabled=True,
+        )
+        self.next_page_button = ft.IconButton(
+            ft.Icons.CHEVRON_RIGHT, on_click=self.next_solutions_page, disabled=True,
+        )
         self.best_solution_container = ft.Column([])
         
         self.step_counter_text = ft.Text("Pasos: 0", size=14, color=ft.Colors.GREY_600)
@@ -321,6 +644,10 @@ class CambioExactoApp:
                             self.limits_input,
                             self.target_input,
                         ], alignment=ft.MainAxisAlignment.CENTER, wrap=True),
+                        ft.Row([
+                            self.max_nodes_input,
+                            self.time_limit_input,
+                        ], alignment=ft.MainAxisAlignment.CENTER, wrap=True),
                         controls_row,
                         self.step_counter_text,
                     ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
@@ -360,7 +687,15 @@ class CambioExactoApp:
                     content=ft.Column([
                         ft.Text("📋 Todas las soluciones", 
                                size=18, weight=ft.FontWeight.BOLD),
-                        self.solutions_container,  # Ahora es un Row con wrap
+                        ft.Row([
+                            self.sort_dropdown,
+                            self.min_coins_filter,
+                            self.max_coins_filter,
+                            self.prev_page_button,
+                            self.page_label,
+                            self.next_page_button,
+                        ], alignment=ft.MainAxisAlignment.CENTER, wrap=True),
+                        self.solutions_container,  # Solo la página actual
                     ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
                     padding=ft.padding.all(20),
                 ),
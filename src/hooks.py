@@ -0,0 +1,233 @@
+import json
+import time
+from typing import List, Dict, Any, Callable, Optional, Sequence, Union
+
+from .step_trace import EXPLORANDO, SOLUCION, RAMA_MUERTA, STATUS_NAMES
+
+
+class SearchHooks:
+    """
+    Interfaz de eventos de la búsqueda. Las subclases sobrescriben solo los
+    métodos que necesitan; los que no se sobrescriben no se llaman.
+    pos es el nivel del nodo y current_sum su suma; en on_prune, reason es
+    el estado de la poda ('podado', 'inalcanzable', 'no divisible' o
+    'memorizado').
+    """
+
+    def on_explore(self, pos: int, current_sum: int) -> None:
+        pass
+
+    def on_prune(self, pos: int, current_sum: int, reason: str) -> None:
+        pass
+
+    def on_solution(self, pos: int, current_sum: int) -> None:
+        pass
+
+    def on_dead_end(self, pos: int, current_sum: int) -> None:
+        pass
+
+
+def _overrides(hooks: SearchHooks, name: str):
+    """Método ligado si la subclase lo sobrescribe, None si no."""
+    if getattr(type(hooks), name) is getattr(SearchHooks, name):
+        return None
+    return getattr(hooks, name)
+
+
+class HookedRecorder:
+    """
+    Registrador de pasos que avisa a uno o varios SearchHooks y delega en el
+    registrador de la traza (StepTrace, StepCounters o None).
+    Solo se interpone cuando hay hooks, así que sin ellos no cuesta nada.
+    """
+
+    def __init__(self, hooks: Union[SearchHooks, Sequence[SearchHooks]], inner=None):
+        if isinstance(hooks, SearchHooks):
+            hooks = [hooks]
+        self.inner = inner
+        self._append = inner.append if inner is not None else None
+        self._explore = self._handlers(hooks, 'on_explore')
+        self._prune = self._handlers(hooks, 'on_prune')
+        self._solution = self._handlers(hooks, 'on_solution')
+        self._dead_end = self._handlers(hooks, 'on_dead_end')
+
+    @staticmethod
+    def _handlers(hooks: Sequence[SearchHooks], name: str) -> tuple:
+        return tuple(handler for handler in (_overrides(h, name) for h in hooks) if handler is not None)
+
+    def append(self, pos: int, current_sum: int, status: int, count: int, parent: int) -> int:
+        if status == EXPLORANDO:
+            for handler in self._explore:
+                handler(pos, current_sum)
+        elif status == SOLUCION:
+            for handler in self._solution:
+                handler(pos, current_sum)
+        elif status == RAMA_MUERTA:
+            for handler in self._dead_end:
+                handler(pos, current_sum)
+        else:
+            for handler in self._prune:
+                handler(pos, current_sum, STATUS_NAMES[status])
+        if self._append is not None:
+            return self._append(pos, current_sum, status, count, parent)
+        return -1
+
+
+class SearchCancelled(Exception):
+    """La búsqueda se detuvo antes de terminar; reason dice por qué."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class SearchBudget(SearchHooks):
+    """
+    Presupuesto y control de una búsqueda en curso.
+    Cada check_every nodos informa el progreso con progress(nodos, soluciones)
+    y detiene la búsqueda (SearchCancelled) si se activó cancel (cualquier
+    objeto con is_set(), p. ej. threading.Event), si se exploraron max_nodes
+    nodos o si pasaron time_limit segundos desde que se creó.
+    """
+
+    def __init__(
+        self,
+        max_nodes: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        cancel=None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        check_every: int = 1024
+    ):
+        self.max_nodes = max_nodes
+        self.cancel = cancel
+        self.progress = progress
+        self.check_every = check_every
+        self.deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self.nodes = 0
+        self.solutions = 0
+        self._next_check = self._following_check()
+
+    def _following_check(self) -> int:
+        following = self.nodes + self.check_every
+        if self.max_nodes is not None:
+            following = min(following, self.max_nodes)
+        return following
+
+    def on_explore(self, pos: int, current_sum: int) -> None:
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self.check()
+
+    def on_solution(self, pos: int, current_sum: int) -> None:
+        self.solutions += 1
+
+    def check(self) -> None:
+        """Informa el progreso y corta la búsqueda si se agotó el presupuesto."""
+        self._next_check = self._following_check()
+        if self.progress is not None:
+            self.progress(self.nodes, self.solutions)
+        if self.cancel is not None and self.cancel.is_set():
+            raise SearchCancelled('cancelado')
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise SearchCancelled('límite de nodos')
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchCancelled('límite de tiempo')
+
+
+class LevelProfiler(SearchHooks):
+    """
+    Perfil por nivel de la búsqueda: nodos explorados, podas por motivo,
+    soluciones, ramas muertas y tiempo pasado en cada nivel (el tiempo entre
+    un evento y el siguiente se asigna al nivel del primero).
+    Se exporta como diccionario, JSON o texto de Prometheus.
+    """
+
+    def __init__(self):
+        self.nodes: List[int] = []
+        self.prunes: List[Dict[str, int]] = []
+        self.solutions: List[int] = []
+        self.dead_ends: List[int] = []
+        self.seconds: List[float] = []
+        self._started: Optional[float] = None
+        self._last_time = 0.0
+        self._last_level = 0
+        self._elapsed = 0.0
+
+    def _level(self, pos: int) -> None:
+        while len(self.nodes) <= pos:
+            self.nodes.append(0)
+            self.prunes.append({})
+            self.solutions.append(0)
+            self.dead_ends.append(0)
+            self.seconds.append(0.0)
+        now = time.perf_counter()
+        if self._started is None:
+            self._started = now
+        else:
+            self.seconds[self._last_level] += now - self._last_time
+        self._elapsed = now - self._started
+        self._last_time = now
+        self._last_level = pos
+
+    def on_explore(self, pos: int, current_sum: int) -> None:
+        self._level(pos)
+        self.nodes[pos] += 1
+
+    def on_prune(self, pos: int, current_sum: int, reason: str) -> None:
+        self._level(pos)
+        self.prunes[pos][reason] = self.prunes[pos].get(reason, 0) + 1
+
+    def on_solution(self, pos: int, current_sum: int) -> None:
+        self._level(pos)
+        self.solutions[pos] += 1
+
+    def on_dead_end(self, pos: int, current_sum: int) -> None:
+        self._level(pos)
+        self.dead_ends[pos] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        total_solutions = sum(self.solutions)
+        levels = []
+        for pos, nodes in enumerate(self.nodes):
+            pruned = sum(self.prunes[pos].values())
+            levels.append({
+                'level': pos,
+                'nodes': nodes,
+                'prunes': dict(self.prunes[pos]),
+                'prune_ratio': pruned / nodes if nodes else 0.0,
+                'solutions': self.solutions[pos],
+                'dead_ends': self.dead_ends[pos],
+                'seconds': self.seconds[pos],
+            })
+        return {
+            'nodes': sum(self.nodes),
+            'solutions': total_solutions,
+            'seconds': self._elapsed,
+            'solutions_per_second': total_solutions / self._elapsed if self._elapsed > 0 else 0.0,
+            'levels': levels,
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+    def to_prometheus(self, prefix: str = 'cambio_exacto') -> str:
+        """Texto en el formato de exposición de Prometheus."""
+        data = self.to_dict()
+        lines = [
+            f"# TYPE {prefix}_nodes_total counter",
+            *(f'{prefix}_nodes_total{{level="{l["level"]}"}} {l["nodes"]}' for l in data['levels']),
+            f"# TYPE {prefix}_prunes_total counter",
+            *(f'{prefix}_prunes_total{{level="{l["level"]}",reason="{reason}"}} {value}'
+              for l in data['levels'] for reason, value in l['prunes'].items()),
+            f"# TYPE {prefix}_prune_ratio gauge",
+            *(f'{prefix}_prune_ratio{{level="{l["level"]}"}} {l["prune_ratio"]}' for l in data['levels']),
+            f"# TYPE {prefix}_solutions_total counter",
+            *(f'{prefix}_solutions_total{{level="{l["level"]}"}} {l["solutions"]}' for l in data['levels']),
+            f"# TYPE {prefix}_dead_ends_total counter",
+            *(f'{prefix}_dead_ends_total{{level="{l["level"]}"}} {l["dead_ends"]}' for l in data['levels']),
+            f"# TYPE {prefix}_level_seconds_total counter",
+            *(f'{prefix}_level_seconds_total{{level="{l["level"]}"}} {l["seconds"]}' for l in data['levels']),
+            f"# TYPE {prefix}_solutions_per_second gauge",
+            f"{prefix}_solutions_per_second {data['solutions_per_second']}",
+        ]
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,266 @@
+import heapq
+from array import array
+from collections import deque
+from functools import reduce
+from itertools import islice
+from math import gcd
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
+
+
+# Celdas (denominaciones × objetivo/mcd) hasta las que las tablas de la DP
+# son baratas: ~1 s y ~8 MB en Python puro. Por encima conviene tomar la
+# mejor solución de las que ya enumeró el backtracking.
+DP_CELL_LIMIT = 1_000_000
+
+
+def _scaled(denominations: List[int], target_amount: int) -> Optional[Tuple[List[int], int]]:
+    """
+    Divide denominaciones y objetivo por el mcd de las denominaciones: las
+    tablas se achican sin cambiar las soluciones. None si el objetivo no es
+    múltiplo del mcd (no hay solución).
+    """
+    divisor = reduce(gcd, denominations, 0)
+    if divisor <= 1:
+        return list(denominations), target_amount
+    if target_amount % divisor:
+        return None
+    return [denom // divisor for denom in denominations], target_amount // divisor
+
+
+def dp_viable(denominations: List[int], target_amount: int) -> bool:
+    """¿Las tablas de la DP para esta instancia caben en DP_CELL_LIMIT celdas?"""
+    scaled = _scaled(denominations, target_amount)
+    return scaled is None or len(denominations) * (scaled[1] + 1) <= DP_CELL_LIMIT
+
+
+def menos_monedas(solutions: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    La primera solución con el mínimo de monedas, o None si no hay. Sobre
+    las soluciones de backtrack_cambio_exacto coincide con dp_cambio_minimo
+    sin construir sus tablas.
+    """
+    return min(solutions, key=lambda solution: sum(solution['combination']), default=None)
+
+
+def top_k_de_soluciones(solutions: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+    """
+    Las k soluciones con menos monedas de una lista ya enumerada, en orden y
+    con la forma de top_k_soluciones ('combination', 'sum' y 'cost').
+    """
+    best = heapq.nsmallest(k, solutions, key=lambda solution: sum(solution['combination']))
+    return [{**solution, 'cost': sum(solution['combination'])} for solution in best]
+
+
+def _suffix_min_cost(
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int,
+    weights: List[Union[int, float]],
+    infinity: Union[int, float]
+) -> List[array]:
+    """
+    Calcula, para cada sufijo de denominaciones, el costo mínimo (la suma de
+    weights[i] por cada moneda de la denominación i) con el que se forma
+    cada cantidad entre 0 y target_amount; infinity marca lo imposible.
+    La tabla i usa solo las denominaciones i..n-1; la tabla n es el caso vacío.
+    Cada fila se obtiene en O(target) con una cola monótona por residuo.
+    """
+    typecode = 'd' if isinstance(infinity, float) else 'q'
+    num_denominations = len(denominations)
+
+    last = array(typecode, [infinity]) * (target_amount + 1)
+    last[0] = 0
+    tables = [last]
+
+    for pos in range(num_denominations - 1, -1, -1):
+        denom = denominations[pos]
+        limit = limits[pos]
+        weight = weights[pos]
+        prev = tables[-1]
+        row = array(typecode, [infinity]) * (target_amount + 1)
+
+        # best[r + j*d] = min_{j-limit <= m <= j} (prev[r + m*d] - m*w) + j*w
+        for residue in range(min(denom, target_amount + 1)):
+            window = deque()
+            for j, amount in enumerate(range(residue, target_amount + 1, denom)):
+                value = prev[amount]
+                if value != infinity:
+                    value -= j * weight
+                    while window and window[-1][1] >= value:
+                        window.pop()
+                    window.append((j, value))
+                while window and window[0][0] < j - limit:
+                    window.popleft()
+                if window:
+                    row[amount] = window[0][1] + j * weight
+        tables.append(row)
+
+    tables.reverse()
+    return tables
+
+
+def _suffix_min_coins(
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int
+) -> List[array]:
+    """Tablas de _suffix_min_cost con costo 1 por moneda (infinito = target_amount + 1)."""
+    # Ninguna cantidad <= objetivo necesita más monedas
+    return _suffix_min_cost(denominations, limits, target_amount, [1] * len(denominations), target_amount + 1)
+
+
+def dp_cambio_minimo(
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Programación dinámica de mochila acotada para el cambio exacto con el
+    mínimo de monedas, en O(n·target/mcd) tiempo y memoria (mcd de las
+    denominaciones; ver dp_viable).
+    Devuelve la misma forma que una solución de backtrack_cambio_exacto:
+      - 'combination': cantidad usada de cada denominación
+      - 'sum': suma obtenida (igual al objetivo)
+    o None si no existe solución. Ante empates elige la misma solución que
+    el primer mínimo encontrado por el backtracking (orden lexicográfico).
+    """
+    if len(denominations) != len(limits):
+        raise ValueError("La cantidad de denominaciones y límites debe ser igual.")
+    if any(denom <= 0 for denom in denominations):
+        raise ValueError("Las denominaciones deben ser positivas.")
+    if target_amount < 0:
+        return None
+    scaled = _scaled(denominations, target_amount)
+    if scaled is None:
+        return None
+    scaled_denominations, remaining = scaled
+
+    tables = _suffix_min_coins(scaled_denominations, limits, remaining)
+    infinity = remaining + 1
+    if tables[0][remaining] == infinity:
+        return None
+
+    # Reconstruir eligiendo la menor cantidad posible en cada posición
+    combination = [0] * len(denominations)
+    for pos, (denom, limit) in enumerate(zip(scaled_denominations, limits)):
+        best = tables[pos][remaining]
+        following = tables[pos + 1]
+        for count in range(min(limit, remaining // denom) + 1):
+            if count + following[remaining - count * denom] == best:
+                combination[pos] = count
+                remaining -= count * denom
+                break
+
+    return {
+        'combination': combination,
+        'sum': target_amount
+    }
+
+
+def contar_soluciones(
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int
+) -> int:
+    """
+    Cuenta las combinaciones de cambio exacto sin enumerarlas.
+    Equivale a len(backtrack_cambio_exacto(...)['solutions']), pero usa una
+    programación dinámica de conteo con monedas acotadas: O(n·target) tiempo,
+    O(target) memoria y resultado exacto con enteros de precisión arbitraria.
+    """
+    if len(denominations) != len(limits):
+        raise ValueError("La cantidad de denominaciones y límites debe ser igual.")
+    if any(denom <= 0 for denom in denominations):
+        raise ValueError("Las denominaciones deben ser positivas.")
+    if target_amount < 0:
+        return 0
+
+    ways = [0] * (target_amount + 1)
+    ways[0] = 1
+    for denom, limit in zip(denominations, limits):
+        window = (limit + 1) * denom
+        new_ways = [0] * (target_amount + 1)
+        # new[a] = prev[a] + prev[a-d] + ... + prev[a-limit*d]
+        for amount in range(target_amount + 1):
+            total = ways[amount]
+            if amount >= denom:
+                total += new_ways[amount - denom]
+                if amount >= window:
+                    total -= ways[amount - window]
+            new_ways[amount] = total
+        ways = new_ways
+
+    return ways[target_amount]
+
+
+def iter_menor_costo(
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int,
+    weights: Optional[List[Union[int, float]]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Genera las soluciones en orden de costo creciente (por defecto, de menos
+    a más monedas; con weights, el costo es la suma de weights[i] por cada
+    moneda de la denominación i, con pesos no negativos).
+    Búsqueda best-first con un heap: la prioridad de un nodo es su costo
+    acumulado más una cota inferior del costo restante, tomada de las tablas
+    de _suffix_min_cost. La cota es exacta, así que nunca se expande un
+    nodo sin solución y cada solución cuesta O(n·límite) expansiones: las
+    primeras k se obtienen sin enumerar las demás. Ante empates se respeta
+    el orden lexicográfico de backtrack_cambio_exacto.
+    Cada solución tiene 'combination', 'sum' y 'cost'.
+    """
+    if len(denominations) != len(limits):
+        raise ValueError("La cantidad de denominaciones y límites debe ser igual.")
+    if any(denom <= 0 for denom in denominations):
+        raise ValueError("Las denominaciones deben ser positivas.")
+    num_denominations = len(denominations)
+    if weights is None:
+        weights = [1] * num_denominations
+    elif len(weights) != num_denominations:
+        raise ValueError("Se necesita un peso por denominación.")
+    if any(weight < 0 for weight in weights):
+        raise ValueError("Los pesos deben ser no negativos.")
+    if target_amount < 0:
+        return
+    scaled = _scaled(denominations, target_amount)
+    if scaled is None:
+        return
+    denominations, remaining = scaled
+
+    if all(isinstance(weight, int) for weight in weights):
+        infinity = sum(weight * limit for weight, limit in zip(weights, limits)) + 1
+    else:
+        infinity = float('inf')
+    bounds = _suffix_min_cost(denominations, limits, remaining, weights, infinity)
+    if bounds[0][remaining] == infinity:
+        return
+
+    # (cota, combinación parcial, costo acumulado, resto)
+    heap = [(bounds[0][remaining], (), 0, remaining)]
+    while heap:
+        _, combination, cost, remaining = heapq.heappop(heap)
+        pos = len(combination)
+        if pos == num_denominations:
+            yield {'combination': list(combination), 'sum': target_amount, 'cost': cost}
+            continue
+        denom = denominations[pos]
+        weight = weights[pos]
+        following = bounds[pos + 1]
+        for count in range(min(limits[pos], remaining // denom) + 1):
+            rest = remaining - count * denom
+            if following[rest] != infinity:
+                child_cost = cost + count * weight
+                heapq.heappush(heap, (child_cost + following[rest], combination + (count,), child_cost, rest))
+
+
+def top_k_soluciones(
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int,
+    k: int,
+    weights: Optional[List[Union[int, float]]] = None
+) -> List[Dict[str, Any]]:
+    """Las k soluciones de menor costo (menos monedas por defecto), en orden; ver iter_menor_costo."""
+    return list(islice(iter_menor_costo(denominations, limits, target_amount, weights), k))
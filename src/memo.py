@@ -0,0 +1,61 @@
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+
+class MemoCache:
+    """
+    Memoria de subárboles sin soluciones, indexada por (nivel, resto).
+    Dos prefijos que llegan al mismo nivel con la misma suma generan el mismo
+    subárbol, así que un estado que ya se exploró sin encontrar soluciones
+    permite saltar el subárbol completo. hits cuenta los subárboles saltados
+    y misses las consultas que no evitaron nada.
+    El tamaño está acotado por maxsize con desalojo LRU.
+    La caché pertenece a un juego de denominaciones y límites (en orden de
+    búsqueda); si se usa con otro se vacía. El objetivo no forma parte de la
+    clave, así que sirve para varias búsquedas con distinto objetivo.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        if maxsize <= 0:
+            raise ValueError("maxsize debe ser positivo.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._instance: Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]] = None
+        self._data: OrderedDict = OrderedDict()
+
+    def bind(self, denominations: List[int], limits: List[int]) -> None:
+        """Asocia la caché a una instancia, vaciándola si era de otra."""
+        instance = (tuple(denominations), tuple(limits))
+        if instance != self._instance:
+            self._instance = instance
+            self._data.clear()
+
+    def is_dead(self, pos: int, remaining: int) -> bool:
+        """¿Se sabe que bajo (pos, remaining) no hay soluciones? Si es así, cuenta un acierto."""
+        key = (pos, remaining)
+        if key not in self._data:
+            self.misses += 1
+            return False
+        self._data.move_to_end(key)
+        self.hits += 1
+        return True
+
+    def put(self, pos: int, remaining: int, solutions: int) -> None:
+        """Registra el resultado del subárbol (pos, remaining); solo se guarda si no tuvo soluciones."""
+        if solutions:
+            return
+        key = (pos, remaining)
+        self._data[key] = True
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
@@ -1,36 +1,46 @@
-import time
 import argparse
 
 import networkx as nx
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 
-from backtraking import backtrack_cambio_exacto
+from .backtraking import backtrack_cambio_exacto, iter_steps
+from .cache import default_cache
+from .step_stream import StepStream
 
+# matplotlib (y los módulos que dibujan) se importan al dibujar: construir
+# el árbol o exportarlo con tree_export no necesita pyplot.
 
-ANIMATION_DELAY = 0.5           # Segundos entre pasos (0 = sin animación)
+
+ANIMATION_DELAY = 0.5           # Segundos entre pasos (0 = en vivo, tan rápido como se pueda dibujar)
 SHOW_STEP_BY_STEP = True        # True = muestra paso a paso, False = solo resultado final
+STREAM_QUEUE_SIZE = 4096        # Pasos en espera como máximo entre el solver y el dibujo
 COLOR_MAP = {
     'root': '#1565C0',
     'explorando': '#FF9800',
     'solución': '#4CAF50',
     'podado': '#F44336',
-    'rama muerta': '#757575'
+    'rama muerta': '#757575',
+    'inalcanzable': '#9C27B0',
+    'no divisible': '#795548',
+    'memorizado': '#00897B'
 }
 
 
 class BacktrackingTreeVisualizer:
-    def __init__(self, denominations, limits, target):
+    def __init__(self, denominations, limits, target, trace=None, order=None):
         self.denominations = denominations
         self.limits = limits
         self.target_amount = target
         self.num_denominations = len(denominations)
+        self.trace = trace              # Traza ya calculada (p. ej. un TraceFile)
+        # Orden de búsqueda: el nivel k decide la denominación order[k]
+        self.order = order if order is not None else getattr(trace, 'order', None)
         
         # Estructura del árbol
         self.tree_graph = nx.DiGraph()
         self.tree_history = []
         self.solutions = []
         self.step_counter = 0
+        self.renderer = None
         
         # Inicializar nodo raíz
         self.tree_graph.add_node('root', 
@@ -42,65 +52,103 @@ class BacktrackingTreeVisualizer:
         node_colors = []
         node_labels = []
 
-    def process_steps(self, steps):
-        """Procesa los pasos devueltos por backtrack_cambio_exacto y construye el árbol."""
-        for idx, step in enumerate(steps):
-            pos = step['pos']
-            current_sum = step['current_sum']
-            combination = step['combination']
-            status = step['status']
-            reason = step.get('reason', "")
-
-            # Crear ID único para el nodo
-            comb_id = "_".join([str(c) for c in combination[:pos]]) if pos > 0 else ""
-            node_id = f"L{pos}_{comb_id}" if comb_id else f"step_{idx}"
-
-            # Determinar parent_id
-            if pos > 0:
-                parent_comb = combination[:pos-1]
-                parent_id = f"L{pos-1}_" + "_".join([str(c) for c in parent_comb]) if parent_comb else 'root'
-            else:
-                parent_id = 'root'
-
-            # Crear etiqueta del nodo
-            if pos > 0 and pos <= len(self.denominations):
-                denomination = self.denominations[pos-1]
-                count = combination[pos-1] if pos-1 >= 0 else 0
-                label = f"D{denomination}:{count}\nΣ={current_sum}"
-            else:
-                continue
+    def add_step(self, idx, step):
+        """Agrega un paso al árbol; devuelve su estado, o None si no crea un nodo."""
+        pos = step['pos']
+        current_sum = step['current_sum']
+        combination = step['combination']
+        status = step['status']
+        reason = step.get('reason', "")
+
+        if status == 'solución':
+            self.solutions.append({'combination': list(combination), 'sum': current_sum})
+
+        # La combinación viene en el orden del llamador y pos es la
+        # profundidad: el camino se lee en el orden de búsqueda
+        path = self.search_path(combination, pos)
+
+        # Crear ID único para el nodo
+        comb_id = "_".join([str(c) for c in path]) if pos > 0 else ""
+        node_id = f"L{pos}_{comb_id}" if comb_id else f"step_{idx}"
+
+        # Determinar parent_id
+        if pos > 0:
+            parent_comb = path[:pos-1]
+            parent_id = f"L{pos-1}_" + "_".join([str(c) for c in parent_comb]) if parent_comb else 'root'
+        else:
+            parent_id = 'root'
+
+        # Crear etiqueta del nodo
+        if pos > 0 and pos <= len(self.denominations):
+            denomination = self.denominations[self.denomination_index(pos - 1)]
+            count = path[pos-1]
+            label = f"D{denomination}:{count}\nΣ={current_sum}"
+        else:
+            return None
+
+        # Agregar nodo al grafo
+        self.tree_graph.add_node(node_id,
+                               label=label,
+                               status=status,
+                               level=pos,
+                               step=idx,
+                               sum=current_sum)
+        # Agregar arista desde el padre
+        if parent_id in self.tree_graph.nodes():
+            self.tree_graph.add_edge(parent_id, node_id)
+        if self.renderer is not None:
+            self.renderer.add_node(node_id, parent_id, pos, COLOR_MAP.get(status, '#CCCCCC'), label)
+
+        # Registrar en historial
+        step_data = {
+            'step': idx,
+            'pos': pos,
+            'current_sum': current_sum,
+            'combination': list(combination),
+            'status': status,
+            'reason': reason,
+            'node_id': node_id
+        }
+        self.tree_history.append(step_data)
+        return status
+
+    def denomination_index(self, level):
+        """Índice (en el orden del llamador) de la denominación que decide el nivel level+1."""
+        return level if self.order is None else self.order[level]
+
+    def search_path(self, combination, pos):
+        """Cantidades decididas en los primeros pos niveles, en el orden de búsqueda."""
+        return [combination[self.denomination_index(level)] for level in range(pos)]
 
-            # Agregar nodo al grafo
-            self.tree_graph.add_node(node_id,
-                                   label=label,
-                                   status=status,
-                                   level=pos,
-                                   step=idx,
-                                   sum=current_sum)
-            # Agregar arista desde el padre
-            if parent_id in self.tree_graph.nodes():
-                self.tree_graph.add_edge(parent_id, node_id)
-
-            # Registrar en historial
-            step_data = {
-                'step': idx,
-                'pos': pos,
-                'current_sum': current_sum,
-                'combination': list(combination),
-                'status': status,
-                'reason': reason,
-                'node_id': node_id
-            }
-            self.tree_history.append(step_data)
-
-            # Animación paso a paso
-            if SHOW_STEP_BY_STEP and ANIMATION_DELAY > 0:
-                self.visualize_current_tree(f"Paso {idx} - {status}")
-                time.sleep(ANIMATION_DELAY)
+    def process_steps(self, steps):
+        """
+        Construye el árbol con los pasos de una lista o de un StepStream.
+        Con ANIMATION_DELAY > 0 se dibuja un cuadro por paso; con 0 se dibuja
+        un cuadro por lote de pasos recibidos, así que si el solver va más
+        rápido que el dibujo se saltan cuadros en lugar de acumular atraso.
+        """
+        animate = SHOW_STEP_BY_STEP and ANIMATION_DELAY > 0
+        if isinstance(steps, StepStream):
+            batches = steps.batches(max_batch=1 if animate else None)
+        else:
+            batches = [steps]
+
+        idx = 0
+        for batch in batches:
+            for step in batch:
+                status = self.add_step(idx, step)
+                # Animación paso a paso
+                if animate and status is not None:
+                    self.visualize_current_tree(f"Paso {idx} - {status}")
+                idx += 1
+            if SHOW_STEP_BY_STEP and not animate:
+                self.visualize_current_tree(f"Paso {idx - 1}")
 
     def run_backtracking(self):
         """Ejecuta el algoritmo completo y muestra el árbol."""
         
+        import matplotlib.pyplot as plt
+
         if SHOW_STEP_BY_STEP:
             plt.ion()  # Modo interactivo para animación
             plt.figure(figsize=(16, 10))
@@ -109,12 +157,26 @@ class BacktrackingTreeVisualizer:
                 manager.full_screen_toggle()
             except Exception:
                 pass
-
-        result = backtrack_cambio_exacto(self.denominations, self.limits, self.target_amount)
-        
-        # Procesar pasos y soluciones
-        self.process_steps(result['steps'])
-        self.solutions = result['solutions']
+            self.renderer = self.new_renderer(plt.gca())
+
+        # Dibujar los pasos a medida que el solver los produce en otro hilo
+        cache = default_cache()
+        cached = None
+        if self.trace is not None:
+            source = self.trace
+        else:
+            cached = cache.get_trace(self.denominations, self.limits, self.target_amount)
+            if cached is not None:
+                source = cached['steps']
+            else:
+                source = iter_steps(self.denominations, self.limits, self.target_amount)
+        stream = StepStream(source, maxsize=STREAM_QUEUE_SIZE)
+        try:
+            self.process_steps(stream)
+        finally:
+            stream.close()
+        if self.trace is None and cached is None:
+            cache.put_solutions(self.denominations, self.limits, self.target_amount, self.solutions)
         
         if SHOW_STEP_BY_STEP:
             plt.ioff()  # Desactivar modo interactivo
@@ -122,90 +184,91 @@ class BacktrackingTreeVisualizer:
         # Mostrar árbol final
         self.visualize_final_tree()
 
-    def hierarchical_layout(self):
-        """Layout jerárquico para el árbol."""
-        pos = {}
-        levels = {}
-        
-        # Agrupar nodos por nivel
-        for node in self.tree_graph.nodes():
-            level = self.tree_graph.nodes[node]['level']
-            if level not in levels:
-                levels[level] = []
-            levels[level].append(node)
-        
-        # Posicionar nodos
-        for level, nodes in levels.items():
-            y = -level * 1.8  # Separación vertical
-            width = len(nodes)
-            
-            # Ordenar por paso para mantener orden de exploración
-            sorted_nodes = sorted(nodes, key=lambda n: self.tree_graph.nodes[n]['step'])
-            
-            for i, node in enumerate(sorted_nodes):
-                x = (i - width/2) * 3.0  # Separación horizontal
-                pos[node] = (x, y)
-
-        self.node_colors = [COLOR_MAP.get(self.tree_graph.nodes[node]['status'], '#CCCCCC')
-                            for node in self.tree_graph.nodes()]
-        self.node_labels = {node: self.tree_graph.nodes[node]['label']
-                            for node in self.tree_graph.nodes()}
-
-        return pos
-
-    def _draw_tree(self, pos, node_colors, node_labels, node_size=2000, edge_width=1.5, edge_alpha=0.7, arrowsize=12, font_size=8):
-        """Dibuja nodos, aristas y etiquetas del árbol."""
-        nx.draw_networkx_edges(
-            self.tree_graph, pos,
-            edge_color='#444444',
-            arrows=True, arrowsize=arrowsize,
-            width=edge_width, alpha=edge_alpha
-        )
-        nx.draw_networkx_nodes(
-            self.tree_graph, pos,
-            node_color=node_colors,
-            node_size=node_size, alpha=0.9,
-            edgecolors='black', linewidths=2
-        )
-        nx.draw_networkx_labels(
-            self.tree_graph, pos, node_labels,
-            font_size=font_size, font_weight='bold', font_color='white'
+    def run_lod(self):
+        """
+        Vista con nivel de detalle para árboles grandes: sin animación, con
+        los subárboles sin soluciones resumidos y expansión con clics.
+        """
+        import matplotlib.pyplot as plt
+        from .tree_lod import LodTree, LodTreeView
+
+        trace = self.trace
+        if trace is None:
+            cache = default_cache()
+            result = cache.get_trace(self.denominations, self.limits, self.target_amount)
+            if result is None:
+                result = backtrack_cambio_exacto(self.denominations, self.limits, self.target_amount)
+                cache.put_trace(self.denominations, self.limits, self.target_amount, result)
+            trace = result['steps']
+
+        tree = LodTree(trace, self.denominations)
+        view = LodTreeView(tree, COLOR_MAP)
+        view.ax.set_title(
+            f'Cambio Exacto para {self.target_amount}\n'
+            f'Denominaciones: {self.denominations} | Límites: {self.limits}\n'
+            f'Nodos: {tree.num_nodes} | Soluciones: {tree.solutions[0] if tree.num_nodes else 0} '
+            f'(clic en un nodo para expandirlo o contraerlo)',
+            fontsize=15, fontweight='bold'
         )
+        plt.show()
 
-    def visualize_current_tree(self, title_suffix=""):
-        """Visualiza el estado actual del árbol."""
-        if not SHOW_STEP_BY_STEP:
-            return
-
-        plt.clf()  # Limpiar plot anterior
+    def new_renderer(self, ax):
+        """Renderizador incremental con la raíz ya dibujada."""
+        from .tree_renderer import IncrementalTreeRenderer
 
-        pos = self.hierarchical_layout()
+        ax.axis('off')
+        renderer = IncrementalTreeRenderer(ax)
+        root = self.tree_graph.nodes['root']
+        renderer.add_node('root', None, 0, COLOR_MAP['root'], root['label'])
+        return renderer
 
-        self._draw_tree(pos, self.node_colors, self.node_labels)
+    def visualize_current_tree(self, title_suffix=""):
+        """Visualiza el estado actual del árbol: solo se actualiza lo que cambió."""
+        if not SHOW_STEP_BY_STEP or self.renderer is None:
+            return
+        import matplotlib.pyplot as plt
 
-        plt.title(
+        self.renderer.ax.set_title(
             f'Árbol de Backtracking - {title_suffix}\n'
             f'Objetivo: {self.target_amount} | Denominaciones: {self.denominations} | Límites: {self.limits}\n',
             fontsize=14, fontweight='bold'
         )
-        plt.axis('off')
-        plt.tight_layout()
-        plt.pause(0.2)  # Pequeña pausa para actualizar
+        self.renderer.refresh()
+        plt.pause(max(ANIMATION_DELAY, 0.001))  # Atiende la ventana mientras espera
 
     def visualize_final_tree(self):
         """Visualización final del árbol completo."""
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(20, 14))
         plt.clf()
+        self.draw_final_tree(plt.gca())
+        plt.tight_layout()
+        plt.show()
 
-        pos = self.hierarchical_layout()
-
-        self._draw_tree(pos, self.node_colors, self.node_labels)
-
-        solutions_count = len([s for s in self.tree_history if s['status'] == 'solution'])
-        pruned_count = len([s for s in self.tree_history if s['status'] == 'pruned'])
-        dead_end_count = len([s for s in self.tree_history if s['status'] == 'dead_end'])
+    def draw_final_tree(self, ax):
+        """Dibuja el árbol completo, el título y la leyenda sobre unos ejes."""
+        import matplotlib.patches as patches
 
-        plt.title(
+        renderer = self.new_renderer(ax)
+        for node, data in self.tree_graph.nodes(data=True):
+            if node == 'root':
+                continue
+            parents = list(self.tree_graph.predecessors(node))
+            renderer.add_node(
+                node, parents[0] if parents else None, data['level'],
+                COLOR_MAP.get(data['status'], '#CCCCCC'), data['label']
+            )
+        renderer.refresh()
+
+        solutions_count = len([s for s in self.tree_history if s['status'] == 'solución'])
+        pruned_count = len([s for s in self.tree_history if s['status'] == 'podado'])
+        dead_end_count = len([s for s in self.tree_history if s['status'] == 'rama muerta'])
+        unreachable_count = len([s for s in self.tree_history if s['status'] == 'inalcanzable'])
+        indivisible_count = len([s for s in self.tree_history if s['status'] == 'no divisible'])
+        memo_count = len([s for s in self.tree_history if s['status'] == 'memorizado'])
+
+        ax.set_title(
             f'Cambio Exacto para {self.target_amount}\n'
             f'Denominaciones: {self.denominations} | Límites: {self.limits}\n'
             f'Pasos totales: {len(self.tree_history)}',
@@ -217,29 +280,50 @@ class BacktrackingTreeVisualizer:
             patches.Circle((0, 0), 0.1, facecolor='#FF9800', edgecolor='black', label='Explorando'),
             patches.Circle((0, 0), 0.1, facecolor='#4CAF50', edgecolor='black', label=f'Solución ✓ ({solutions_count})'),
             patches.Circle((0, 0), 0.1, facecolor='#F44336', edgecolor='black', label=f'Podado ✗ ({pruned_count})'),
-            patches.Circle((0, 0), 0.1, facecolor='#757575', edgecolor='black', label=f'Sin solución ∅ ({dead_end_count})')
+            patches.Circle((0, 0), 0.1, facecolor='#757575', edgecolor='black', label=f'Sin solución ∅ ({dead_end_count})'),
+            patches.Circle((0, 0), 0.1, facecolor='#9C27B0', edgecolor='black', label=f'Inalcanzable ({unreachable_count})'),
+            patches.Circle((0, 0), 0.1, facecolor='#795548', edgecolor='black', label=f'No divisible ({indivisible_count})'),
+            patches.Circle((0, 0), 0.1, facecolor='#00897B', edgecolor='black', label=f'Memorizado ({memo_count})')
         ]
 
-        plt.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(0.02, 0.98),
-                   fontsize=12, frameon=True, fancybox=True, shadow=True)
-
-        plt.axis('off')
-        plt.tight_layout()
-        plt.show()
+        ax.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(0.02, 0.98),
+                  fontsize=12, frameon=True, fancybox=True, shadow=True)
+        return renderer
 
-def view_backtracking_tree(denominations: list[int], limits: list[int], target_amount: int) -> None:
+def view_backtracking_tree(denominations: list[int], limits: list[int], target_amount: int, lod: bool = False) -> None:
     visualizer = BacktrackingTreeVisualizer(denominations, limits, target_amount)
-    visualizer.run_backtracking()
+    if lod:
+        visualizer.run_lod()
+    else:
+        visualizer.run_backtracking()
+
+
+def view_trace_file(path, lod: bool = False) -> None:
+    """Visualiza una traza guardada en un archivo .cxtrace, sin volver a resolver."""
+    from .trace_file import TraceFile
+
+    trace = TraceFile(path)
+    visualizer = BacktrackingTreeVisualizer(trace.denominations, trace.limits, trace.target_amount, trace)
+    if lod:
+        visualizer.run_lod()
+    else:
+        visualizer.run_backtracking()
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Visualiza el árbol de backtracking para el problema de cambio exacto.")
-    parser.add_argument('--denominations', nargs='+', type=int, required=True, help='Lista de denominaciones (ej: 1 3)')
-    parser.add_argument('--limits', nargs='+', type=int, required=True, help='Lista de límites para cada denominación (ej: 2 3)')
-    parser.add_argument('--target', type=int, required=True, help='Cantidad objetivo (ej: 6)')
+    parser.add_argument('--denominations', nargs='+', type=int, help='Lista de denominaciones (ej: 1 3)')
+    parser.add_argument('--limits', nargs='+', type=int, help='Lista de límites para cada denominación (ej: 2 3)')
+    parser.add_argument('--target', type=int, help='Cantidad objetivo (ej: 6)')
+    parser.add_argument('--trace', help='Archivo .cxtrace con una traza ya calculada (en lugar de la instancia)')
+    parser.add_argument('--lod', action='store_true', help='Vista con nivel de detalle para árboles grandes')
     args = parser.parse_args()
 
-    if len(args.denominations) != len(args.limits):
-        raise ValueError("La cantidad de denominaciones y límites debe ser igual.")
-
-    view_backtracking_tree(args.denominations, args.limits, args.target)
+    if args.trace:
+        view_trace_file(args.trace, args.lod)
+    else:
+        if args.denominations is None or args.limits is None or args.target is None:
+            parser.error("se requieren --denominations, --limits y --target (o --trace)")
+        if len(args.denominations) != len(args.limits):
+            raise ValueError("La cantidad de denominaciones y límites debe ser igual.")
+        view_backtracking_tree(args.denominations, args.limits, args.target, args.lod)
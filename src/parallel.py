@@ -0,0 +1,149 @@
+import heapq
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple
+
+from .backtraking import SearchInstance, prepare_instance, search_subtree
+from .memo import MemoCache
+from .step_trace import EXPLORANDO, TRACE_COUNTERS, TRACE_FULL, make_recorder
+
+
+def _max_count(instance: SearchInstance, target_amount: int, prune: bool, pos: int, current_sum: int) -> int:
+    """
+    Última cantidad que probaría el motor en este nodo, o -1 si el nodo es
+    terminal (mismos casos base y podas que search_subtree).
+    """
+    remaining = target_amount - current_sum
+    if remaining <= 0 or pos == len(instance.denominations):
+        return -1
+    if not prune:
+        return instance.limits[pos]
+    if remaining > instance.suffix_max[pos] or remaining % instance.suffix_gcd[pos]:
+        return -1
+    return min(instance.limits[pos], remaining // instance.denominations[pos] + 1)
+
+
+def _estimate(instance: SearchInstance, pos: int, remaining: int) -> int:
+    """Cota del tamaño del subárbol: producto de las cantidades posibles por nivel."""
+    size = 1
+    for denom, limit in zip(instance.denominations[pos:], instance.limits[pos:]):
+        size *= min(limit, max(remaining, 0) // denom) + 2
+        if size > 1 << 62:
+            break
+    return size
+
+
+def split_work(
+    instance: SearchInstance,
+    target_amount: int,
+    num_units: int,
+    max_depth: int,
+    prune: bool = True
+) -> Tuple[List[Tuple[int, ...]], int]:
+    """
+    Divide el árbol en unidades de trabajo independientes.
+    Expande primero los subárboles estimados como más grandes (división
+    adaptativa), sin pasar de max_depth niveles, hasta tener num_units
+    unidades. Devuelve los prefijos en el orden del recorrido en profundidad
+    y la cantidad de nodos internos expandidos.
+    """
+    heap = [(-_estimate(instance, 0, target_amount), (), 0)]
+    done = []
+    expanded = 0
+    while heap and len(heap) + len(done) < num_units:
+        _, prefix, current_sum = heapq.heappop(heap)
+        pos = len(prefix)
+        max_count = _max_count(instance, target_amount, prune, pos, current_sum)
+        if pos >= max_depth or max_count < 0:
+            done.append(prefix)
+            continue
+        expanded += 1
+        denom = instance.denominations[pos]
+        for count in range(max_count + 1):
+            child_sum = current_sum + count * denom
+            size = _estimate(instance, pos + 1, target_amount - child_sum)
+            heapq.heappush(heap, (-size, prefix + (count,), child_sum))
+
+    units = done + [prefix for _, prefix, _ in heap]
+    units.sort()
+    return units, expanded
+
+
+def _solve_unit(
+    instance: SearchInstance,
+    target_amount: int,
+    trace: str,
+    prune: bool,
+    memo_size: Optional[int],
+    prefix: Tuple[int, ...]
+) -> Tuple[List[Dict[str, Any]], Optional[List[int]]]:
+    steps = make_recorder(trace, len(instance.denominations), instance.order)
+    memo = MemoCache(memo_size) if memo_size else None
+    solutions = search_subtree(instance, target_amount, steps, prune, memo, prefix)
+    return solutions, steps.by_status if steps is not None else None
+
+
+def backtrack_cambio_exacto_paralelo(
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int,
+    workers: Optional[int] = None,
+    split_depth: int = 3,
+    units_per_worker: int = 8,
+    trace: str = TRACE_COUNTERS,
+    prune: bool = True,
+    order: Optional[str] = None,
+    memo_size: Optional[int] = None,
+    executor: Optional[Executor] = None
+) -> Dict[str, Any]:
+    """
+    Backtracking en paralelo sobre un ProcessPoolExecutor.
+    Divide el árbol en hasta workers·units_per_worker subárboles, cortando
+    a lo sumo split_depth niveles y expandiendo primero los más grandes,
+    y los reparte con chunksize 1 para que los procesos libres tomen la
+    siguiente unidad pendiente. Las soluciones se devuelven en el mismo
+    orden que backtrack_cambio_exacto.
+    trace admite 'counters' o 'none' (la traza completa no se reparte entre
+    procesos). Con memo_size cada unidad usa su propia MemoCache.
+    Se puede pasar un executor ya creado para reutilizarlo entre llamadas;
+    en plataformas con 'spawn' hay que llamarla bajo if __name__ == "__main__".
+    """
+    if trace == TRACE_FULL:
+        raise ValueError("La búsqueda paralela no genera traza completa (usa 'counters' o 'none').")
+    instance = prepare_instance(denominations, limits, order)
+    workers = workers or os.cpu_count() or 1
+    steps = make_recorder(trace, len(denominations), instance.order)
+
+    units, expanded = split_work(instance, target_amount, workers * units_per_worker, split_depth, prune)
+    solve = partial(_solve_unit, instance, target_amount, trace, prune, memo_size)
+
+    if workers == 1 or len(units) == 1:
+        results = map(solve, units)
+        solutions = _merge(results, steps)
+    elif executor is not None:
+        solutions = _merge(executor.map(solve, units, chunksize=1), steps)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            solutions = _merge(pool.map(solve, units, chunksize=1), steps)
+
+    # Los nodos internos expandidos al dividir cuentan como pasos explorados
+    if steps is not None:
+        steps.by_status[EXPLORANDO] += expanded
+        steps.total += expanded
+    return {
+        'solutions': solutions,
+        'steps': steps
+    }
+
+
+def _merge(results, steps) -> List[Dict[str, Any]]:
+    """Une los resultados por unidad en orden y acumula sus contadores."""
+    solutions = []
+    for unit_solutions, unit_counts in results:
+        solutions.extend(unit_solutions)
+        if steps is not None:
+            for code, value in enumerate(unit_counts):
+                steps.by_status[code] += value
+            steps.total += sum(unit_counts)
+    return solutions
@@ -0,0 +1,70 @@
+from typing import List
+
+
+class ReachabilityTable:
+    """
+    Tabla de sumas alcanzables por sufijo de denominaciones.
+    Para cada nivel k guarda, como bitset, qué cantidades entre 0 y
+    max_amount se pueden formar con las denominaciones k..n-1 sin pasar sus
+    límites. Los bitsets se construyen con enteros de Python mediante
+    desplazamientos y OR (división binaria de cada límite, O(log límite)
+    operaciones por denominación) y se congelan en bytes, así que cada
+    consulta es O(1).
+    Sirve para podar la búsqueda y para responder, sin buscar, si existe
+    cambio exacto para cualquier objetivo hasta max_amount.
+    """
+
+    def __init__(self, denominations: List[int], limits: List[int], max_amount: int):
+        if len(denominations) != len(limits):
+            raise ValueError("La cantidad de denominaciones y límites debe ser igual.")
+        if max_amount < 0:
+            raise ValueError("max_amount no puede ser negativo.")
+        self.denominations = list(denominations)
+        self.limits = list(limits)
+        self.max_amount = max_amount
+
+        num_bytes = max_amount // 8 + 1
+        mask = (1 << (max_amount + 1)) - 1
+        reachable = 1       # Solo el 0 con el sufijo vacío
+        bitsets = [reachable.to_bytes(num_bytes, 'little')]
+        for denom, limit in zip(reversed(self.denominations), reversed(self.limits)):
+            # Sumar de 0 a limit monedas: trozos 1, 2, 4, ... y el resto
+            chunk = 1
+            left = limit
+            while left > 0:
+                take = min(chunk, left)
+                reachable |= (reachable << (take * denom)) & mask
+                left -= take
+                chunk *= 2
+            bitsets.append(reachable.to_bytes(num_bytes, 'little'))
+        bitsets.reverse()
+        self._bitsets = bitsets
+
+    def reachable(self, pos: int, amount: int) -> bool:
+        """¿Se puede formar amount con las denominaciones pos..n-1?"""
+        if amount < 0 or amount > self.max_amount:
+            return False
+        return bool(self._bitsets[pos][amount >> 3] >> (amount & 7) & 1)
+
+    def feasible(self, amount: int) -> bool:
+        """¿Existe cambio exacto para amount con todas las denominaciones?"""
+        return self.reachable(0, amount)
+
+    def next_count(self, pos: int, remaining: int, start: int, stop: int) -> int:
+        """
+        Menor cantidad entre start y stop de la denominación pos que deja un
+        resto alcanzable por los niveles siguientes, o -1 si no hay ninguna.
+        """
+        denom = self.denominations[pos]
+        following = self._bitsets[pos + 1]
+        for count in range(start, stop + 1):
+            amount = remaining - count * denom
+            if amount < 0:
+                break
+            if amount <= self.max_amount and following[amount >> 3] >> (amount & 7) & 1:
+                return count
+        return -1
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(bitset) for bitset in self._bitsets)
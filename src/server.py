@@ -0,0 +1,286 @@
+import os
+import json
+import asyncio
+import argparse
+import ipaddress
+import multiprocessing as mp
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from .solver import resolver
+
+
+MAX_BODY_BYTES = 1 << 20
+HEADER_TIMEOUT = 10.0
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    408: 'Request Timeout', 413: 'Payload Too Large', 500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_list(query: Dict[str, Any], name: str) -> Tuple[int, ...]:
+    values = query.get(name)
+    if not isinstance(values, list) or not all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        raise HttpError(400, f"'{name}' debe ser una lista de enteros")
+    return tuple(values)
+
+
+def _optional_number(query: Dict[str, Any], name: str, kind, cap):
+    """Presupuesto pedido, acotado por el máximo del servidor."""
+    value = query.get(name)
+    if value is None:
+        return cap
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise HttpError(400, f"'{name}' debe ser un número positivo")
+    value = kind(value)
+    return value if cap is None else min(value, cap)
+
+
+class SolverService:
+    """
+    Servicio HTTP/JSON (solo biblioteca estándar) sobre el núcleo del solver.
+    Las búsquedas corren en un ProcessPoolExecutor; las consultas idénticas
+    que llegan mientras una está en curso esperan el mismo cálculo, así que
+    una ráfaga de consultas iguales cuesta una sola búsqueda. Como mucho hay
+    max_pending cálculos distintos en curso o en espera; los que exceden ese
+    límite se rechazan con 503 y Retry-After. Cada consulta puede pedir
+    max_nodes y time_limit, acotados por los del servidor.
+    Rutas:
+      - POST /solve: {"denominations": [...], "limits": [...], "target": n,
+        "max_nodes": n, "time_limit": s, "include_solutions": bool}
+      - GET /metrics: métricas en el formato de texto de Prometheus
+      - GET /health
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        time_limit: Optional[float] = None
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        # 'spawn': un proceso hecho con fork heredaría los sockets abiertos y
+        # las conexiones no se cerrarían al responder
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context('spawn'))
+        self.max_pending = max_pending or 4 * self.workers
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.in_flight: Dict[tuple, asyncio.Future] = {}
+        self.responses: Counter = Counter()
+        self.solves = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.interrupted = 0
+        self.solve_seconds = 0.0
+
+    def _query_key(self, query: Any) -> tuple:
+        if not isinstance(query, dict):
+            raise HttpError(400, "se esperaba un objeto JSON")
+        denominations = _int_list(query, 'denominations')
+        limits = _int_list(query, 'limits')
+        target = query.get('target')
+        if not isinstance(target, int) or isinstance(target, bool):
+            raise HttpError(400, "'target' debe ser un entero")
+        if len(denominations) != len(limits):
+            raise HttpError(400, "La cantidad de denominaciones y límites debe ser igual.")
+        if any(d <= 0 for d in denominations) or any(l < 0 for l in limits) or target < 0:
+            raise HttpError(400, "denominaciones positivas, límites y objetivo no negativos")
+        return (
+            denominations, limits, target,
+            _optional_number(query, 'max_nodes', int, self.max_nodes),
+            _optional_number(query, 'time_limit', float, self.time_limit),
+            bool(query.get('include_solutions', True)),
+        )
+
+    async def _compute(self, key: tuple) -> Dict[str, Any]:
+        denominations, limits, target, max_nodes, time_limit, include_solutions = key
+        start = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self.pool, resolver, list(denominations), list(limits), target,
+                max_nodes, time_limit, include_solutions
+            )
+        finally:
+            self.in_flight.pop(key, None)
+            self.solve_seconds += time.perf_counter() - start
+        self.solves += 1
+        if result['interrupted']:
+            self.interrupted += 1
+        return result
+
+    async def solve(self, query: Any) -> Dict[str, Any]:
+        """Resuelve la consulta o se suma al cálculo idéntico que ya está en curso."""
+        key = self._query_key(query)
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            if len(self.in_flight) >= self.max_pending:
+                self.rejected += 1
+                raise HttpError(503, "servicio saturado, reintente más tarde")
+            future = self.in_flight[key] = asyncio.ensure_future(self._compute(key))
+        # shield: si un cliente se desconecta, el cálculo sigue para los demás
+        return await asyncio.shield(future)
+
+    def metrics(self) -> str:
+        lines = [
+            '# HELP cambio_exacto_requests_total Respuestas HTTP por código.',
+            '# TYPE cambio_exacto_requests_total counter',
+        ]
+        lines += [f'cambio_exacto_requests_total{{code="{code}"}} {count}'
+                  for code, count in sorted(self.responses.items())]
+        for name, kind, text, value in (
+            ('solves_total', 'counter', 'Búsquedas ejecutadas.', self.solves),
+            ('coalesced_total', 'counter', 'Consultas resueltas por un cálculo idéntico en curso.', self.coalesced),
+            ('rejected_total', 'counter', 'Consultas rechazadas por saturación (503).', self.rejected),
+            ('interrupted_total', 'counter', 'Búsquedas detenidas por su presupuesto.', self.interrupted),
+            ('solve_seconds_total', 'counter', 'Segundos de búsqueda, incluida la espera en el pool.', self.solve_seconds),
+            ('in_flight', 'gauge', 'Cálculos distintos en curso o en espera.', len(self.in_flight)),
+            ('max_pending', 'gauge', 'Cálculos distintos admitidos antes de responder 503.', self.max_pending),
+        ):
+            lines += [
+                f'# HELP cambio_exacto_{name} {text}',
+                f'# TYPE cambio_exacto_{name} {kind}',
+                f'cambio_exacto_{name} {value}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), HEADER_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HttpError(408, "tiempo de espera agotado") from None
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, "cabeceras demasiado grandes") from None
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, path, _ = lines[0].split(' ', 2)
+        except ValueError:
+            raise HttpError(400, "línea de petición inválida") from None
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HttpError(400, "Content-Length inválido") from None
+        if length < 0:
+            raise HttpError(400, "Content-Length inválido")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "cuerpo demasiado grande")
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length), HEADER_TIMEOUT) if length else b''
+        except asyncio.TimeoutError:
+            raise HttpError(408, "tiempo de espera agotado") from None
+        return method, path.split('?', 1)[0], body
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, str, bytes, Dict[str, str]]:
+        if path == '/solve':
+            if method != 'POST':
+                raise HttpError(405, "use POST")
+            try:
+                query = json.loads(body)
+            except (ValueError, UnicodeDecodeError):
+                raise HttpError(400, "JSON inválido") from None
+            result = await self.solve(query)
+            return 200, 'application/json', json.dumps(result, ensure_ascii=False).encode(), {}
+        if path == '/metrics' and method == 'GET':
+            return 200, 'text/plain; version=0.0.4', self.metrics().encode(), {}
+        if path == '/health' and method == 'GET':
+            return 200, 'application/json', b'{"status": "ok"}', {}
+        raise HttpError(404, "ruta desconocida")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atiende una conexión: una petición y una respuesta (Connection: close)."""
+        extra = {}
+        try:
+            method, path, body = await self._read_request(reader)
+            status, content_type, payload, extra = await self._route(method, path, body)
+        except HttpError as error:
+            status, content_type = error.status, 'application/json'
+            payload = json.dumps({'error': str(error)}, ensure_ascii=False).encode()
+            if status == 503:
+                extra = {'Retry-After': '1'}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as error:
+            status, content_type = 500, 'application/json'
+            payload = json.dumps({'error': f"{type(error).__name__}: {error}"}, ensure_ascii=False).encode()
+
+        self.responses[status] += 1
+        head = [
+            f'HTTP/1.1 {status} {REASONS.get(status, "")}',
+            f'Content-Type: {content_type}',
+            f'Content-Length: {len(payload)}',
+            'Connection: close',
+        ] + [f'{name}: {value}' for name, value in extra.items()]
+        try:
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + payload)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def close(self) -> None:
+        self.pool.shutdown(cancel_futures=True)
+
+
+def is_loopback(host: str) -> bool:
+    """Si host es localhost o una dirección IP de loopback."""
+    try:
+        return host == 'localhost' or ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8765, **options) -> None:
+    """
+    Levanta el servicio y atiende hasta que se interrumpa.
+    Solo escucha en direcciones loopback: el servicio no tiene autenticación.
+    """
+    if not is_loopback(host):
+        raise ValueError("el servicio solo escucha en direcciones loopback")
+    service = SolverService(**options)
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Servicio de cambio exacto en http://{host}:{port} "
+          f"({service.workers} procesos, hasta {service.max_pending} cálculos en espera)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON local para consultas de cambio exacto.")
+    parser.add_argument('--host', default='127.0.0.1', help='Dirección local (solo loopback)')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, help='Procesos del pool (por defecto, uno por núcleo)')
+    parser.add_argument('--max-pending', type=int, help='Cálculos distintos en espera antes de responder 503')
+    parser.add_argument('--max-nodes', type=int, help='Máximo de nodos por consulta')
+    parser.add_argument('--time-limit', type=float, help='Máximo de segundos por consulta')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(
+            args.host, args.port, workers=args.workers, max_pending=args.max_pending,
+            max_nodes=args.max_nodes, time_limit=args.time_limit
+        ))
+    except ValueError as error:
+        parser.error(str(error))
+    except KeyboardInterrupt:
+        pass
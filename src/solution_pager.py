@@ -0,0 +1,91 @@
+import heapq
+from itertools import islice
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+
+SORT_FOUND = 'found'
+SORT_FEWEST = 'asc'
+SORT_MOST = 'desc'
+
+
+def coin_count(solution: Dict[str, Any]) -> int:
+    return sum(solution['combination'])
+
+
+class SolutionPager:
+    """
+    Páginas de soluciones leídas de una fuente en streaming.
+    source es una función que devuelve un iterador nuevo de soluciones
+    (p. ej. lambda: iter_solutions(...) o lambda: iter(lista)).
+    Filtra por cantidad de monedas (min_coins..max_coins) y ordena por
+    cantidad de monedas ('asc' o 'desc'; 'found' conserva el orden de hallazgo).
+    Sin orden solo se consume la fuente hasta la página pedida; con orden se
+    recorre una vez y se guardan las mejores con un heap acotado, nunca
+    todas las soluciones filtradas.
+    Cada solución conserva su número en el orden de hallazgo (desde 1).
+    """
+
+    def __init__(
+        self,
+        source: Callable[[], Iterable[Dict[str, Any]]],
+        page_size: int = 24,
+        sort: str = SORT_FOUND,
+        min_coins: Optional[int] = None,
+        max_coins: Optional[int] = None
+    ):
+        if sort not in (SORT_FOUND, SORT_FEWEST, SORT_MOST):
+            raise ValueError(f"Orden desconocido: {sort!r}")
+        if page_size < 1:
+            raise ValueError("page_size debe ser positivo.")
+        self.source = source
+        self.page_size = page_size
+        self.sort = sort
+        self.min_coins = min_coins
+        self.max_coins = max_coins
+        self._stream: Optional[Iterator[Tuple[int, int, Dict[str, Any]]]] = None
+        self._loaded: List[Tuple[int, int, Dict[str, Any]]] = []
+        self._exhausted = False
+
+    def _filtered(self) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """(monedas, número, solución) de las soluciones que pasan el filtro."""
+        for number, solution in enumerate(self.source(), start=1):
+            coins = coin_count(solution)
+            if self.min_coins is not None and coins < self.min_coins:
+                continue
+            if self.max_coins is not None and coins > self.max_coins:
+                continue
+            yield coins, number, solution
+
+    def _load(self, stop: int) -> None:
+        """Deja en _loaded al menos stop elementos (o todos los que haya)."""
+        if self._exhausted or len(self._loaded) >= stop:
+            return
+        if self.sort == SORT_FOUND:
+            if self._stream is None:
+                self._stream = self._filtered()
+            self._loaded.extend(islice(self._stream, stop - len(self._loaded)))
+            wanted = stop
+        else:
+            # Cada recorrido duplica lo guardado para no releer la fuente en cada página
+            wanted = max(stop, 2 * len(self._loaded))
+            if self.sort == SORT_FEWEST:
+                self._loaded = heapq.nsmallest(wanted, self._filtered(), key=lambda item: (item[0], item[1]))
+            else:
+                self._loaded = heapq.nsmallest(wanted, self._filtered(), key=lambda item: (-item[0], item[1]))
+        if len(self._loaded) < wanted:
+            self._exhausted = True
+
+    def page(self, index: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Pares (número, solución) de la página index (desde 0)."""
+        start = index * self.page_size
+        self._load(start + self.page_size + 1)     # Uno más para saber si hay otra página
+        return [(number, solution) for _, number, solution in self._loaded[start:start + self.page_size]]
+
+    def has_next(self, index: int) -> bool:
+        self._load((index + 1) * self.page_size + 1)
+        return len(self._loaded) > (index + 1) * self.page_size
+
+    @property
+    def total(self) -> Optional[int]:
+        """Cantidad de soluciones filtradas, o None si aún no se leyó toda la fuente."""
+        return len(self._loaded) if self._exhausted else None
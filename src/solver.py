@@ -0,0 +1,58 @@
+import time
+from typing import Any, Dict, List, Optional
+
+from .backtraking import backtrack_cambio_exacto
+from .hooks import SearchBudget
+from .knapsack import dp_cambio_minimo, dp_viable, menos_monedas
+
+
+def resolver(
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int,
+    max_nodes: Optional[int] = None,
+    time_limit: Optional[float] = None,
+    include_solutions: bool = True
+) -> Dict[str, Any]:
+    """
+    Núcleo del solver sin dependencias externas (ni flet, ni matplotlib, ni
+    NumPy): resuelve una instancia y devuelve un registro listo para JSON.
+    Con max_nodes o time_limit la búsqueda puede detenerse antes y
+    'interrupted' indica el motivo (las soluciones son entonces parciales).
+    Devuelve un diccionario con:
+      - 'count': cantidad de soluciones
+      - 'solutions': las combinaciones encontradas (si include_solutions)
+      - 'best' y 'best_coins': la combinación con menos monedas, o None;
+        se toma de las soluciones encontradas, salvo que la búsqueda se
+        haya detenido y la DP sea barata (dp_viable)
+      - 'steps': pasos por estado de la búsqueda
+      - 'interrupted' y 'wall_time'
+    """
+    if len(denominations) != len(limits):
+        raise ValueError("La cantidad de denominaciones y límites debe ser igual.")
+    start = time.perf_counter()
+    hooks = None
+    if max_nodes is not None or time_limit is not None:
+        hooks = SearchBudget(max_nodes=max_nodes, time_limit=time_limit)
+    result = backtrack_cambio_exacto(denominations, limits, target_amount, trace='counters', hooks=hooks)
+    if result['interrupted'] and dp_viable(denominations, target_amount):
+        best = dp_cambio_minimo(denominations, limits, target_amount)
+    else:
+        best = menos_monedas(result['solutions'])
+
+    record = {
+        'denominations': list(denominations),
+        'limits': list(limits),
+        'target': target_amount,
+        'count': len(result['solutions']),
+    }
+    if include_solutions:
+        record['solutions'] = [solution['combination'] for solution in result['solutions']]
+    record.update({
+        'best': best['combination'] if best else None,
+        'best_coins': sum(best['combination']) if best else None,
+        'steps': result['steps'].as_dict(),
+        'interrupted': result['interrupted'],
+        'wall_time': time.perf_counter() - start,
+    })
+    return record
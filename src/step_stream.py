@@ -0,0 +1,72 @@
+import queue
+import threading
+from typing import Any, Iterable, Iterator, List, Optional
+
+
+_END = object()
+
+
+class StepStream:
+    """
+    Pasos de la búsqueda producidos por un hilo trabajador y entregados en
+    una cola acotada. Si el consumidor (p. ej. el visualizador) se atrasa, la
+    cola se llena y el trabajador espera (contrapresión), así que la memoria
+    no depende del tamaño del árbol. El consumidor lee por lotes: cada lote
+    trae lo que se acumuló desde el anterior, de modo que dibujar un cuadro
+    por lote descarta cuadros intermedios cuando el solver va más rápido.
+    """
+
+    def __init__(self, steps: Iterable[Any], maxsize: int = 4096):
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._produce, args=(steps,), daemon=True)
+        self.thread.start()
+
+    def _put(self, item) -> bool:
+        """Encola esperando lugar; False si el consumidor cerró el flujo."""
+        while not self._stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, steps: Iterable[Any]) -> None:
+        try:
+            for step in steps:
+                if not self._put(step):
+                    return
+        except BaseException as error:
+            self.error = error
+        self._put(_END)
+
+    def batches(self, max_batch: Optional[int] = None) -> Iterator[List[Any]]:
+        """
+        Lotes de pasos en orden: espera al menos uno y agrega los que ya
+        estén en la cola, hasta max_batch. Re-lanza el error del trabajador.
+        """
+        while True:
+            batch = [self.queue.get()]
+            while batch[-1] is not _END and (max_batch is None or len(batch) < max_batch):
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _END:
+                batch.pop()
+                if batch:
+                    yield batch
+                if self.error is not None:
+                    raise self.error
+                return
+            yield batch
+
+    def __iter__(self) -> Iterator[Any]:
+        for batch in self.batches():
+            yield from batch
+
+    def close(self) -> None:
+        """Detiene al trabajador si el consumidor ya no quiere más pasos."""
+        self._stop.set()
@@ -0,0 +1,135 @@
+from array import array
+from collections.abc import Sequence
+from typing import List, Dict, Optional
+
+
+# Códigos de estado de un paso (columna 'status' de la traza)
+EXPLORANDO = 0
+PODADO = 1
+SOLUCION = 2
+RAMA_MUERTA = 3
+INALCANZABLE = 4        # El resto supera lo que suman las denominaciones restantes
+NO_DIVISIBLE = 5        # El resto no es múltiplo del mcd de las denominaciones restantes
+MEMORIZADO = 6          # El mismo (nivel, resto) ya se exploró sin soluciones
+
+STATUS_NAMES = (
+    'explorando', 'podado', 'solución', 'rama muerta', 'inalcanzable', 'no divisible', 'memorizado'
+)
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+# Modos de traza aceptados por backtrack_cambio_exacto
+TRACE_NONE = 'none'
+TRACE_COUNTERS = 'counters'
+TRACE_FULL = 'full'
+TRACE_MODES = (TRACE_NONE, TRACE_COUNTERS, TRACE_FULL)
+
+
+class StepCounters:
+    """
+    Traza mínima: solo cuenta los pasos por estado.
+    len() devuelve el total de pasos, igual que con la lista completa.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.by_status = [0] * len(STATUS_NAMES)
+
+    def append(self, pos: int, current_sum: int, status: int, count: int, parent: int) -> int:
+        self.by_status[status] += 1
+        self.total += 1
+        return -1
+
+    def __len__(self) -> int:
+        return self.total
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: self.by_status[code] for code, name in enumerate(STATUS_NAMES)}
+
+
+class StepTrace(Sequence):
+    """
+    Traza completa en columnas (struct-of-arrays) con arrays tipados.
+    Cada paso guarda su nivel, su suma, un código de estado, la cantidad
+    elegida en el nivel anterior y el índice del paso padre; la combinación
+    se reconstruye bajo demanda recorriendo los padres.
+    Si la búsqueda reordenó las denominaciones, order[k] es el índice
+    original del nivel k y las combinaciones se devuelven en ese orden.
+    Se comporta como la lista de diccionarios de pasos original: admite
+    len(), índices e iteración, y cada elemento es un diccionario nuevo.
+    """
+
+    def __init__(self, num_denominations: int, order: Optional[List[int]] = None):
+        self.num_denominations = num_denominations
+        self.order = order
+        self.pos = array('I')
+        self.current_sum = array('q')
+        self.status = array('B')
+        self.count = array('I')
+        self.parent = array('q')
+
+    def append(self, pos: int, current_sum: int, status: int, count: int, parent: int) -> int:
+        """Agrega un paso y devuelve su índice."""
+        self.pos.append(pos)
+        self.current_sum.append(current_sum)
+        self.status.append(status)
+        self.count.append(count)
+        self.parent.append(parent)
+        return len(self.status) - 1
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def combination(self, index: int) -> List[int]:
+        """
+        Reconstruye la combinación del paso: las cantidades del camino desde
+        la raíz y ceros en las denominaciones aún no decididas.
+        """
+        combination = [0] * self.num_denominations
+        order = self.order
+        pos = self.pos[index]
+        while pos > 0:
+            combination[pos - 1 if order is None else order[pos - 1]] = self.count[index]
+            index = self.parent[index]
+            pos -= 1
+        return combination
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de paso fuera de rango")
+        return {
+            'pos': self.pos[index],
+            'current_sum': self.current_sum[index],
+            'combination': self.combination(index),
+            'status': STATUS_NAMES[self.status[index]]
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada por las columnas de la traza."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self.pos, self.current_sum, self.status, self.count, self.parent)
+        )
+
+    def counters(self) -> StepCounters:
+        """Resume la traza en contadores por estado."""
+        counters = StepCounters()
+        for code in self.status:
+            counters.by_status[code] += 1
+        counters.total = len(self.status)
+        return counters
+
+
+def make_recorder(trace: str, num_denominations: int, order: Optional[List[int]] = None):
+    """Crea el registrador de pasos para el modo de traza indicado."""
+    if trace == TRACE_FULL:
+        return StepTrace(num_denominations, order)
+    if trace == TRACE_COUNTERS:
+        return StepCounters()
+    if trace == TRACE_NONE:
+        return None
+    raise ValueError(f"Modo de traza desconocido: {trace!r} (usa uno de {TRACE_MODES})")
@@ -0,0 +1,134 @@
+import mmap
+import struct
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from .step_trace import STATUS_NAMES, StepCounters, StepTrace
+
+
+# Formato .cxtrace (todo en little-endian, así que sirve entre máquinas):
+#   cabecera: magic, versión, banderas, n, cantidad de pasos, objetivo
+#   n denominaciones (int64), n límites (int64) y, con FLAG_ORDER, el orden
+#   de búsqueda (n uint32), rellenado hasta múltiplo de 8
+#   un registro de 32 bytes por paso, en el orden de la búsqueda
+MAGIC = b'CXTRACE\0'
+VERSION = 1
+FLAG_ORDER = 1
+HEADER = struct.Struct('<8sHHIQq')
+RECORD = np.dtype([
+    ('current_sum', '<i8'),
+    ('parent', '<i8'),
+    ('pos', '<u4'),
+    ('count', '<u4'),
+    ('status', 'u1'),
+    ('_padding', 'V7'),
+])
+
+
+def _records_offset(num_denominations: int, has_order: bool) -> int:
+    size = HEADER.size + 16 * num_denominations + (4 * num_denominations if has_order else 0)
+    return -(-size // 8) * 8
+
+
+def write_trace(
+    path,
+    trace: StepTrace,
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int
+) -> None:
+    """Guarda una StepTrace con su instancia en un archivo .cxtrace."""
+    num_denominations = len(denominations)
+    has_order = trace.order is not None
+    records = np.zeros(len(trace), dtype=RECORD)
+    for name in ('current_sum', 'parent', 'pos', 'count', 'status'):
+        column = getattr(trace, name)
+        records[name] = np.asarray(column)
+
+    header = HEADER.pack(
+        MAGIC, VERSION, FLAG_ORDER if has_order else 0,
+        num_denominations, len(trace), target_amount
+    )
+    header += struct.pack(f'<{num_denominations}q', *denominations)
+    header += struct.pack(f'<{num_denominations}q', *limits)
+    if has_order:
+        header += struct.pack(f'<{num_denominations}I', *trace.order)
+    header = header.ljust(_records_offset(num_denominations, has_order), b'\0')
+
+    with open(path, 'wb') as file:
+        file.write(header)
+        file.write(records.tobytes())
+
+
+class TraceFile(StepTrace):
+    """
+    Traza leída de un archivo .cxtrace con memoria mapeada: las columnas
+    son vistas de NumPy sobre el archivo, sin copiarlo ni recalcular nada.
+    Se usa igual que la StepTrace original (len, índices, combination,
+    counters) y trae la instancia: denominations, limits y target_amount.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"{self.path}: archivo de traza incompleto")
+        magic, version, flags, num_denominations, num_steps, target = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: no es un archivo de traza")
+        if version != VERSION:
+            raise ValueError(f"{self.path}: versión de traza no soportada ({version})")
+
+        offset = HEADER.size
+        self.denominations = list(struct.unpack_from(f'<{num_denominations}q', self._mmap, offset))
+        offset += 8 * num_denominations
+        self.limits = list(struct.unpack_from(f'<{num_denominations}q', self._mmap, offset))
+        offset += 8 * num_denominations
+        order = None
+        if flags & FLAG_ORDER:
+            order = list(struct.unpack_from(f'<{num_denominations}I', self._mmap, offset))
+        self.target_amount = target
+        self.num_denominations = num_denominations
+        self.order = order
+
+        start = _records_offset(num_denominations, order is not None)
+        if len(self._mmap) < start + num_steps * RECORD.itemsize:
+            raise ValueError(f"{self.path}: archivo de traza incompleto")
+        self.records = np.frombuffer(self._mmap, dtype=RECORD, count=num_steps, offset=start)
+        self.pos = self.records['pos']
+        self.current_sum = self.records['current_sum']
+        self.status = self.records['status']
+        self.count = self.records['count']
+        self.parent = self.records['parent']
+
+    def append(self, pos: int, current_sum: int, status: int, count: int, parent: int) -> int:
+        raise TypeError("Una traza leída de archivo no se puede modificar.")
+
+    def combination(self, index: int) -> List[int]:
+        return [int(count) for count in super().combination(index)]
+
+    def __getitem__(self, index):
+        step = super().__getitem__(index)
+        if isinstance(step, dict):
+            step['pos'] = int(step['pos'])
+            step['current_sum'] = int(step['current_sum'])
+        return step
+
+    @property
+    def nbytes(self) -> int:
+        return self.records.nbytes
+
+    def counters(self) -> StepCounters:
+        counters = StepCounters()
+        counters.by_status = [int(value) for value in np.bincount(self.status, minlength=len(STATUS_NAMES))]
+        counters.total = len(self.status)
+        return counters
+
+    def close(self) -> None:
+        """Libera el mapeo; la traza no se puede usar después."""
+        self.records = self.pos = self.current_sum = self.status = self.count = self.parent = None
+        self._mmap.close()
+
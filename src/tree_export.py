@@ -0,0 +1,160 @@
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Sequence
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from networkx.readwrite import json_graph
+
+from .backtraking import iter_steps
+from .batch import leer_archivos
+from .network_steps import COLOR_MAP, BacktrackingTreeVisualizer
+from .trace_file import TraceFile
+
+
+FORMATS = ('png', 'svg', 'dot', 'json')
+
+
+def _dot_string(text: str) -> str:
+    return '"' + str(text).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def write_dot(graph, path) -> None:
+    """Escribe el árbol en formato DOT de GraphViz, con los colores de COLOR_MAP."""
+    lines = [
+        'digraph backtracking {',
+        '  node [shape=circle, style=filled, fontcolor=white, fontsize=8];',
+    ]
+    for node, data in graph.nodes(data=True):
+        color = COLOR_MAP.get(data['status'], '#CCCCCC')
+        lines.append(f'  {_dot_string(node)} [label={_dot_string(data["label"])}, fillcolor="{color}"];')
+    for parent, child in graph.edges():
+        lines.append(f'  {_dot_string(parent)} -> {_dot_string(child)};')
+    lines.append('}')
+    Path(path).write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def write_json(graph, path) -> None:
+    """Escribe el árbol como JSON node-link (networkx.node_link_data)."""
+    data = json_graph.node_link_data(graph, edges='edges')
+    Path(path).write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+
+def _agg_axes(figsize, dpi):
+    figure = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(figure)
+    return figure, figure.add_subplot()
+
+
+def export_tree(
+    denominations: List[int],
+    limits: List[int],
+    target_amount: int,
+    output,
+    formats: Sequence[str] = ('png',),
+    steps: Optional[Iterable[Dict[str, Any]]] = None,
+    frame_every: Optional[int] = None,
+    dpi: int = 100,
+    figsize=(20, 14)
+) -> List[Path]:
+    """
+    Exporta el árbol de backtracking sin pantalla ni pausas: imágenes PNG/SVG
+    con el backend Agg, DOT de GraphViz y JSON node-link. output es la ruta
+    sin extensión; con frame_every también se guarda un cuadro PNG cada
+    frame_every pasos en output_pasos/. steps puede ser una traza ya
+    calculada (p. ej. un TraceFile); si no, los pasos se generan con
+    iter_steps sin guardar la traza completa.
+    Devuelve las rutas escritas.
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Formatos desconocidos: {sorted(unknown)}")
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if steps is None:
+        steps = iter_steps(denominations, limits, target_amount)
+
+    # Una traza guardada con orden de búsqueda (StepTrace.order) lo trae consigo
+    visualizer = BacktrackingTreeVisualizer(denominations, limits, target_amount, order=getattr(steps, 'order', None))
+    written = []
+    if frame_every:
+        frames_dir = output.parent / f"{output.name}_pasos"
+        frames_dir.mkdir(exist_ok=True)
+        frame_figure, frame_axes = _agg_axes(figsize, dpi)
+        visualizer.renderer = visualizer.new_renderer(frame_axes)
+
+    for idx, step in enumerate(steps):
+        status = visualizer.add_step(idx, step)
+        if frame_every and status is not None and idx % frame_every == 0:
+            frame_axes.set_title(f"Paso {idx} - {status}", fontsize=14, fontweight='bold')
+            visualizer.renderer.refresh()
+            path = frames_dir / f"paso_{idx:07d}.png"
+            frame_figure.savefig(path)
+            written.append(path)
+
+    images = [fmt for fmt in formats if fmt in ('png', 'svg')]
+    if images:
+        figure, axes = _agg_axes(figsize, dpi)
+        visualizer.draw_final_tree(axes)
+        figure.tight_layout()
+        for fmt in images:
+            path = output.with_suffix(f".{fmt}")
+            figure.savefig(path)
+            written.append(path)
+    if 'dot' in formats:
+        path = output.with_suffix('.dot')
+        write_dot(visualizer.tree_graph, path)
+        written.append(path)
+    if 'json' in formats:
+        path = output.with_suffix('.json')
+        write_json(visualizer.tree_graph, path)
+        written.append(path)
+    return written
+
+
+def exportar_caso(job: Dict[str, Any]) -> List[str]:
+    """Exporta un caso del lote (un diccionario con la instancia o la ruta de una traza)."""
+    options = {
+        'formats': job['formats'],
+        'frame_every': job.get('frame_every'),
+        'dpi': job.get('dpi', 100),
+    }
+    if 'trace' in job:
+        trace = TraceFile(job['trace'])
+        try:
+            paths = export_tree(trace.denominations, trace.limits, trace.target_amount,
+                                job['output'], steps=trace, **options)
+        finally:
+            trace.close()
+    else:
+        paths = export_tree(job['denominations'], job['limits'], job['target'], job['output'], **options)
+    return [str(path) for path in paths]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta árboles de backtracking sin pantalla (PNG/SVG/DOT/JSON).")
+    parser.add_argument('files', nargs='*', type=Path, help='Archivos con el formato de casos_cambio_exacto.txt')
+    parser.add_argument('--trace', nargs='+', default=[], type=Path, help='Archivos .cxtrace a exportar')
+    parser.add_argument('--output-dir', '-o', type=Path, default=Path('arboles'), help='Directorio de salida')
+    parser.add_argument('--formats', nargs='+', default=['png'], choices=FORMATS)
+    parser.add_argument('--frames-every', type=int, help='Guardar un cuadro PNG cada N pasos')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=1, help='Procesos para exportar en paralelo')
+    args = parser.parse_args()
+
+    common = {'formats': args.formats, 'frame_every': args.frames_every, 'dpi': args.dpi}
+    jobs = [
+        {**case, **common, 'output': args.output_dir / f"caso_{number:04d}"}
+        for number, case in enumerate(leer_archivos(args.files), start=1)
+    ]
+    jobs += [{'trace': path, **common, 'output': args.output_dir / path.stem} for path in args.trace]
+
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = pool.map(exportar_caso, jobs, chunksize=4)
+            total = sum(len(paths) for paths in results)
+    else:
+        total = sum(len(exportar_caso(job)) for job in jobs)
+    print(f"{len(jobs)} árboles exportados ({total} archivos) en {args.output_dir}")
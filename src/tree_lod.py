@@ -0,0 +1,291 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+from .step_trace import EXPLORANDO, SOLUCION, STATUS_NAMES, StepTrace
+
+
+class LodTree:
+    """
+    Árbol de búsqueda compacto, con IDs enteros, construido con NumPy a
+    partir de una StepTrace (o de un TraceFile, sin copiar el archivo).
+    Cada nodo es un paso 'explorando'; su resultado (podado, solución,
+    rama muerta, ...) es el paso que lo sigue, si lo hay.
+    Los IDs están en preorden, así que el subárbol del nodo v son los IDs
+    v .. v + size[v] - 1, y para cada nodo se guardan el tamaño de su
+    subárbol y cuántas soluciones contiene.
+    """
+
+    def __init__(self, trace: StepTrace, denominations: List[int]):
+        status = np.asarray(trace.status)
+        parent_step = np.asarray(trace.parent)
+        explored = np.flatnonzero(status == EXPLORANDO)
+        num_nodes = len(explored)
+
+        node_of_step = np.full(len(status), -1, dtype=np.int64)
+        node_of_step[explored] = np.arange(num_nodes)
+        self.level = np.asarray(trace.pos)[explored].astype(np.int64)
+        self.sum = np.asarray(trace.current_sum)[explored].astype(np.int64)
+        self.count = np.asarray(trace.count)[explored].astype(np.int64)
+        parents = parent_step[explored]
+        self.parent = np.where(parents >= 0, node_of_step[np.maximum(parents, 0)], -1)
+
+        # El resultado de un nodo es el paso inmediatamente posterior a su 'explorando'
+        self.outcome = np.full(num_nodes, EXPLORANDO, dtype=np.uint8)
+        results = np.flatnonzero(status != EXPLORANDO)
+        self.outcome[node_of_step[results - 1]] = status[results]
+
+        # Agregados por subárbol, de las hojas hacia la raíz, un nivel a la vez
+        self.size = np.ones(num_nodes, dtype=np.int64)
+        self.solutions = (self.outcome == SOLUCION).astype(np.int64)
+        for level in range(int(self.level.max(initial=0)), 0, -1):
+            members = np.flatnonzero((self.level == level) & (self.parent >= 0))
+            np.add.at(self.size, self.parent[members], self.size[members])
+            np.add.at(self.solutions, self.parent[members], self.solutions[members])
+
+        # Hijos de cada nodo en formato CSR (ya quedan en orden de exploración)
+        by_parent = np.argsort(self.parent, kind='stable')
+        sorted_parents = self.parent[by_parent]
+        self._children = by_parent
+        self._first_child = np.searchsorted(sorted_parents, np.arange(num_nodes), side='left')
+        self._last_child = np.searchsorted(sorted_parents, np.arange(num_nodes), side='right')
+
+        self.order = trace.order
+        self.denominations = list(denominations)
+        self.num_nodes = num_nodes
+
+    def children(self, node: int) -> np.ndarray:
+        return self._children[self._first_child[node]:self._last_child[node]]
+
+    def breakdown(self, nodes: np.ndarray) -> Dict[str, int]:
+        """Cantidad de nodos por resultado en los subárboles de nodes."""
+        totals = np.zeros(len(STATUS_NAMES), dtype=np.int64)
+        for node in nodes:
+            totals += np.bincount(self.outcome[node:node + self.size[node]], minlength=len(STATUS_NAMES))
+        return {STATUS_NAMES[code]: int(value) for code, value in enumerate(totals) if value}
+
+    def label(self, node: int) -> str:
+        level = int(self.level[node])
+        if level == 0:
+            return f"Raíz\nΣ={self.sum[node]}"
+        index = level - 1 if self.order is None else self.order[level - 1]
+        return f"D{self.denominations[index]}:{self.count[node]}\nΣ={self.sum[node]}"
+
+
+# Elementos visibles: ('node', id) o ('group', id del padre) para los hijos
+# sin soluciones de un nodo, resumidos en un solo nodo agregado
+Item = Tuple[str, int]
+
+
+class LodTreeView:
+    """
+    Vista con nivel de detalle de un LodTree en matplotlib.
+    Los hijos sin soluciones de cada nodo se resumen en un nodo agregado
+    (cuadrado) con la cantidad de nodos por resultado; al inicio se
+    expanden, a lo ancho, los nodos con soluciones mientras quepan en
+    budget elementos. Un clic en un nodo lo expande o lo contrae, y un clic
+    en un agregado muestra sus nodos uno a uno. Las etiquetas solo se
+    dibujan cuando caben en la pantalla con el zoom actual.
+    """
+
+    def __init__(
+        self,
+        tree: LodTree,
+        color_map: Dict[str, str],
+        budget: int = 1500,
+        label_points: float = 42.0,
+        max_labels: int = 400,
+        ax=None
+    ):
+        self.tree = tree
+        self.color_map = color_map
+        self.label_points = label_points
+        self.max_labels = max_labels
+        self.expanded = set()
+        self.expanded_groups = set()
+        self.items: List[Item] = []
+        self.xy = np.zeros((0, 2))
+        self._texts = []
+
+        if ax is None:
+            _, ax = plt.subplots(figsize=(20, 14))
+        self.ax = ax
+        ax.axis('off')
+        self.edges = LineCollection([], colors='#444444', linewidths=1.0, alpha=0.7, zorder=1)
+        ax.add_collection(self.edges)
+        self.nodes = ax.scatter([], [], marker='o', edgecolors='black', linewidths=1, zorder=2)
+        self.groups = ax.scatter([], [], marker='s', edgecolors='black', linewidths=1, zorder=2)
+
+        if tree.num_nodes:
+            self.auto_expand(budget)
+        self.redraw()
+        ax.callbacks.connect('xlim_changed', lambda _: self.update_labels())
+        ax.figure.canvas.mpl_connect('button_press_event', self.on_click)
+
+    def _child_items(self, node: int) -> List[Item]:
+        children = self.tree.children(node)
+        if node in self.expanded_groups:
+            return [('node', int(child)) for child in children]
+        items = [('node', int(child)) for child in children if self.tree.solutions[child] > 0]
+        without = children[self.tree.solutions[children] == 0]
+        if len(without) == 1:
+            items.append(('node', int(without[0])))
+        elif len(without) > 1:
+            items.append(('group', node))
+        return items
+
+    def auto_expand(self, budget: int) -> None:
+        """Expande primero los nodos con soluciones mientras haya lugar."""
+        visible = 1
+        pending = [0]
+        while pending:
+            node = pending.pop(0)
+            children = self._child_items(node)
+            if visible + len(children) > budget:
+                break
+            self.expanded.add(node)
+            visible += len(children)
+            pending.extend(child for kind, child in children if kind == 'node' and self.tree.solutions[child] > 0)
+
+    def _layout(self) -> None:
+        """Ubica los elementos visibles: hojas seguidas y padres sobre sus hijos."""
+        items: List[Item] = []
+        parents: List[int] = []
+        levels: List[int] = []
+        stack = [(('node', 0), -1)] if self.tree.num_nodes else []
+        while stack:
+            item, parent = stack.pop()
+            index = len(items)
+            items.append(item)
+            parents.append(parent)
+            kind, node = item
+            levels.append(int(self.tree.level[node]) + (1 if kind == 'group' else 0))
+            if kind == 'node' and node in self.expanded:
+                stack.extend((child, index) for child in reversed(self._child_items(node)))
+
+        count = len(items)
+        x = np.zeros(count)
+        low = np.full(count, np.inf)
+        high = np.full(count, -np.inf)
+        has_children = np.zeros(count, dtype=bool)
+        has_children[[p for p in parents if p >= 0]] = True
+        leaves = np.flatnonzero(~has_children)
+        x[leaves] = np.arange(len(leaves))
+        for index in range(count - 1, -1, -1):
+            if has_children[index]:
+                x[index] = (low[index] + high[index]) / 2
+            parent = parents[index]
+            if parent >= 0:
+                low[parent] = min(low[parent], x[index])
+                high[parent] = max(high[parent], x[index])
+
+        self.items = items
+        self.parents = np.array(parents, dtype=np.int64)
+        self.xy = np.column_stack([x, -np.array(levels, dtype=float)]) if count else np.zeros((0, 2))
+
+    def _item_color(self, item: Item) -> str:
+        kind, node = item
+        if kind == 'group':
+            breakdown = self._group_breakdown(node)
+            return self.color_map.get(max(breakdown, key=breakdown.get), '#CCCCCC')
+        if node == 0:
+            return self.color_map['root']
+        return self.color_map.get(STATUS_NAMES[self.tree.outcome[node]], '#CCCCCC')
+
+    def _group_nodes(self, node: int) -> np.ndarray:
+        children = self.tree.children(node)
+        return children[self.tree.solutions[children] == 0]
+
+    def _group_breakdown(self, node: int) -> Dict[str, int]:
+        return self.tree.breakdown(self._group_nodes(node))
+
+    def _item_label(self, item: Item) -> str:
+        kind, node = item
+        if kind == 'group':
+            nodes = self._group_nodes(node)
+            return f"×{len(nodes)}\n{int(self.tree.size[nodes].sum())} nodos"
+        label = self.tree.label(node)
+        if node not in self.expanded and self.tree.size[node] > 1:
+            label += f"\n+{self.tree.size[node] - 1}"
+        return label
+
+    def redraw(self) -> None:
+        self._layout()
+        is_group = np.array([kind == 'group' for kind, _ in self.items], dtype=bool)
+        colors = [self._item_color(item) for item in self.items]
+        self.nodes.set_offsets(self.xy[~is_group] if len(self.items) else np.zeros((0, 2)))
+        self.nodes.set_facecolors([c for c, g in zip(colors, is_group) if not g])
+        self.groups.set_offsets(self.xy[is_group] if len(self.items) else np.zeros((0, 2)))
+        self.groups.set_facecolors([c for c, g in zip(colors, is_group) if g])
+        with_parent = np.flatnonzero(self.parents >= 0)
+        self.edges.set_segments(np.stack([self.xy[self.parents[with_parent]], self.xy[with_parent]], axis=1)
+                                if len(with_parent) else [])
+
+        if len(self.items):
+            width = self.xy[:, 0].max() + 1
+            depth = -self.xy[:, 1].min() + 1
+            self.ax.set_xlim(-1, width)
+            self.ax.set_ylim(-depth, 1)
+            box = self.ax.get_window_extent()
+            points = 72 / self.ax.figure.dpi
+            diameter = 0.7 * min(box.width * points / (width + 1), box.height * points / (depth + 1))
+            size = max(4.0, min(900.0, diameter ** 2))
+            self.nodes.set_sizes([size])
+            self.groups.set_sizes([size])
+        self.update_labels()
+        self.ax.figure.canvas.draw_idle()
+
+    def update_labels(self) -> None:
+        """Dibuja las etiquetas de los elementos a la vista solo si caben."""
+        for text in self._texts:
+            text.remove()
+        self._texts = []
+        if not len(self.items):
+            return
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        box = self.ax.get_window_extent()
+        points_per_unit = box.width * 72 / self.ax.figure.dpi / max(x1 - x0, 1e-9)
+        if points_per_unit < self.label_points:
+            return
+        in_view = np.flatnonzero(
+            (self.xy[:, 0] >= min(x0, x1)) & (self.xy[:, 0] <= max(x0, x1)) &
+            (self.xy[:, 1] >= min(y0, y1)) & (self.xy[:, 1] <= max(y0, y1))
+        )
+        if len(in_view) > self.max_labels:
+            return
+        font_size = min(8.0, points_per_unit / 6)
+        for index in in_view:
+            x, y = self.xy[index]
+            self._texts.append(self.ax.text(
+                x, y - 0.35, self._item_label(self.items[index]),
+                ha='center', va='top', fontsize=font_size, zorder=3
+            ))
+
+    def item_at(self, x_pixels: float, y_pixels: float, radius: float = 12.0) -> Optional[Item]:
+        if not len(self.items):
+            return None
+        display = self.ax.transData.transform(self.xy)
+        distances = np.hypot(display[:, 0] - x_pixels, display[:, 1] - y_pixels)
+        nearest = int(np.argmin(distances))
+        return self.items[nearest] if distances[nearest] <= radius else None
+
+    def toggle(self, item: Item) -> None:
+        """Expande o contrae un nodo; un agregado se abre en sus nodos."""
+        kind, node = item
+        if kind == 'group':
+            self.expanded_groups.add(node)
+        elif node in self.expanded:
+            self.expanded.discard(node)
+        elif self.tree.size[node] > 1:
+            self.expanded.add(node)
+        self.redraw()
+
+    def on_click(self, event) -> None:
+        toolbar = getattr(event.canvas, 'toolbar', None)
+        if event.inaxes is not self.ax or event.button != 1 or (toolbar is not None and toolbar.mode):
+            return
+        item = self.item_at(event.x, event.y)
+        if item is not None:
+            self.toggle(item)
@@ -0,0 +1,153 @@
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+
+class IncrementalTreeRenderer:
+    """
+    Dibuja el árbol de backtracking de forma incremental sobre unos ejes.
+    Los nodos viven en una sola colección (scatter) y las aristas en una
+    LineCollection que se conservan entre cuadros: cada paso solo agrega un
+    nodo o cambia su color, sin limpiar la figura ni recalcular el layout.
+    Las posiciones se asignan al llegar cada nodo y no cambian después: un
+    nodo queda en y = -nivel, y en x lo más cerca posible de su padre sin
+    encimarse con los nodos ya ubicados en su nivel.
+    Los nodos se achican cuando ya no caben con node_size y las etiquetas
+    solo se dibujan mientras el árbol tiene a lo sumo label_limit nodos.
+    """
+
+    def __init__(
+        self,
+        ax,
+        node_size: float = 2000,
+        label_limit: int = 200,
+        x_spacing: float = 3.0,
+        y_spacing: float = 1.8,
+        font_size: int = 8
+    ):
+        self.ax = ax
+        self.node_size = node_size
+        self.label_limit = label_limit
+        self.x_spacing = x_spacing
+        self.y_spacing = y_spacing
+        self.font_size = font_size
+
+        self.index: Dict[Hashable, int] = {}
+        self.num_nodes = 0
+        self.num_edges = 0
+        self._next_slot: List[int] = []     # Primera columna libre de cada nivel
+        self._slots = np.zeros(64, dtype=np.int64)
+        self._xy = np.zeros((64, 2))
+        self._colors = np.zeros((64, 4))
+        self._segments = np.zeros((64, 2, 2))
+        self._labels: List[Optional[str]] = []
+        self._texts = []
+        self._rgba: Dict[str, tuple] = {}
+        self._dirty = False
+
+        self.nodes = ax.scatter(
+            [], [], s=node_size, alpha=0.9, edgecolors='black', linewidths=2, zorder=2
+        )
+        self.edges = LineCollection([], colors='#444444', linewidths=1.5, alpha=0.7, zorder=1)
+        ax.add_collection(self.edges)
+
+    def _color(self, color: str) -> tuple:
+        rgba = self._rgba.get(color)
+        if rgba is None:
+            rgba = self._rgba[color] = to_rgba(color)
+        return rgba
+
+    @staticmethod
+    def _grow(values: np.ndarray, needed: int) -> np.ndarray:
+        if needed <= len(values):
+            return values
+        grown = np.zeros((max(needed, 2 * len(values)),) + values.shape[1:], dtype=values.dtype)
+        grown[:len(values)] = values
+        return grown
+
+    def add_node(
+        self,
+        key: Hashable,
+        parent: Optional[Hashable],
+        level: int,
+        color: str,
+        label: Optional[str] = None
+    ) -> int:
+        """Agrega un nodo (o solo lo recolorea si ya existe) y devuelve su índice."""
+        index = self.index.get(key)
+        if index is not None:
+            self._colors[index] = self._color(color)
+            self._dirty = True
+            return index
+
+        index = self.index[key] = self.num_nodes
+        self.num_nodes += 1
+        self._slots = self._grow(self._slots, self.num_nodes)
+        self._xy = self._grow(self._xy, self.num_nodes)
+        self._colors = self._grow(self._colors, self.num_nodes)
+
+        while len(self._next_slot) <= level:
+            self._next_slot.append(0)
+        parent_index = self.index.get(parent) if parent is not None else None
+        slot = self._next_slot[level]
+        if parent_index is not None:
+            slot = max(slot, int(self._slots[parent_index]))
+        self._next_slot[level] = slot + 1
+        self._slots[index] = slot
+        self._xy[index] = (slot * self.x_spacing, -level * self.y_spacing)
+        self._colors[index] = self._color(color)
+        self._labels.append(label)
+
+        if parent_index is not None:
+            self._segments = self._grow(self._segments, self.num_edges + 1)
+            self._segments[self.num_edges] = (self._xy[parent_index], self._xy[index])
+            self.num_edges += 1
+        self._dirty = True
+        return index
+
+    def set_color(self, key: Hashable, color: str) -> None:
+        self._colors[self.index[key]] = self._color(color)
+        self._dirty = True
+
+    def _update_labels(self) -> None:
+        if self.num_nodes > self.label_limit:
+            for text in self._texts:
+                text.set_visible(False)
+            return
+        for index in range(len(self._texts), self.num_nodes):
+            x, y = self._xy[index]
+            self._texts.append(self.ax.text(
+                x, y, self._labels[index] or '',
+                ha='center', va='center', fontsize=self.font_size,
+                fontweight='bold', color='white', zorder=3
+            ))
+
+    def refresh(self) -> None:
+        """Pasa los cambios a los artistas y ajusta los límites de los ejes."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        count = self.num_nodes
+        self.nodes.set_offsets(self._xy[:count])
+        self.nodes.set_facecolors(self._colors[:count])
+        self.edges.set_segments(self._segments[:self.num_edges])
+        self._update_labels()
+        if count:
+            margin_x = self.x_spacing
+            margin_y = self.y_spacing / 2
+            width = max(self._next_slot) * self.x_spacing + margin_x
+            height = (len(self._next_slot) - 1) * self.y_spacing + 2 * margin_y
+            self.ax.set_xlim(-margin_x, width - margin_x)
+            self.ax.set_ylim(margin_y - height, margin_y)
+
+            # Diámetro (en puntos) que cabe entre dos nodos vecinos
+            box = self.ax.get_window_extent()
+            points = 72 / self.ax.figure.dpi
+            diameter = 0.8 * min(
+                self.x_spacing * box.width * points / width,
+                self.y_spacing * box.height * points / height
+            )
+            self.nodes.set_sizes([min(self.node_size, diameter ** 2)])
+        self.ax.figure.canvas.draw_idle()
@@ -0,0 +1,139 @@
+import threading
+import multiprocessing as mp
+from typing import Callable, List, Optional
+
+
+def _serve(conn) -> None:
+    """
+    Bucle del proceso visualizador. La pila de gráficos (matplotlib,
+    networkx) se importa una sola vez al arrancar; después cada pedido solo
+    abre su ventana. Los pedidos se atienden en orden: el siguiente se abre
+    cuando se cierra la ventana actual.
+    """
+    import matplotlib.pyplot as plt
+    from .network_steps import view_backtracking_tree, view_trace_file
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        job, kind, args = request
+        try:
+            if kind == 'trace':
+                view_trace_file(*args)
+            else:
+                view_backtracking_tree(*args)
+        except Exception as error:
+            conn.send(('error', job, f"{type(error).__name__}: {error}"))
+        else:
+            conn.send(('ok', job, None))
+        finally:
+            plt.close('all')
+
+
+class VisualizerWorker:
+    """
+    Proceso visualizador de larga vida. Se inicia al primer pedido (con
+    'spawn', para no heredar los hilos de la GUI) y se reutiliza en los
+    siguientes, así que el arranque del intérprete y las importaciones de
+    matplotlib se pagan una sola vez. Los pedidos viajan por un Pipe y
+    submit no espera a que se cierre la ventana; un hilo lector recibe los
+    resultados y llama a on_done(job) u on_error(job, mensaje). Si el
+    proceso muere, se avisa con on_error y el próximo pedido lo relanza.
+    """
+
+    def __init__(
+        self,
+        on_done: Optional[Callable[[int], None]] = None,
+        on_error: Optional[Callable[[Optional[int], str], None]] = None
+    ):
+        self.on_done = on_done
+        self.on_error = on_error
+        self.process = None
+        self.conn = None
+        self.pending: List[int] = []    # Pedidos enviados y todavía sin respuesta
+        self._next_job = 0
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        context = mp.get_context('spawn')
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(target=_serve, args=(child_conn,), name='visualizador', daemon=True)
+        process.start()
+        child_conn.close()
+        self.process, self.conn = process, parent_conn
+        self.pending = []
+        threading.Thread(target=self._read, args=(process, parent_conn), daemon=True).start()
+
+    def _read(self, process, conn) -> None:
+        while True:
+            try:
+                kind, job, message = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                if job in self.pending:
+                    self.pending.remove(job)
+            if kind == 'error':
+                if self.on_error is not None:
+                    self.on_error(job, message)
+            elif self.on_done is not None:
+                self.on_done(job)
+
+        process.join()
+        with self._lock:
+            if process is not self.process:
+                return      # Se cerró a propósito o ya se relanzó
+            lost, self.pending = self.pending, []
+            self.process = self.conn = None
+        if process.exitcode and self.on_error is not None:
+            self.on_error(lost[0] if lost else None,
+                          f"El visualizador terminó inesperadamente (código {process.exitcode})")
+
+    def _submit(self, kind: str, args: tuple) -> int:
+        with self._lock:
+            if self.process is None or not self.process.is_alive():
+                self._start()
+            self._next_job += 1
+            job = self._next_job
+            try:
+                self.conn.send((job, kind, args))
+            except OSError:
+                self._start()
+                self.conn.send((job, kind, args))
+            self.pending.append(job)
+            return job
+
+    @property
+    def busy(self) -> bool:
+        """¿Hay una ventana abierta o pedidos en espera?"""
+        return bool(self.pending)
+
+    def show_instance(self, denominations: List[int], limits: List[int], target_amount: int, lod: bool = False) -> int:
+        """Pide visualizar una instancia resolviéndola en el proceso; devuelve el número de pedido."""
+        return self._submit('instance', (list(denominations), list(limits), target_amount, lod))
+
+    def show_trace(self, path, lod: bool = False) -> int:
+        """Pide visualizar una traza guardada en un archivo .cxtrace; devuelve el número de pedido."""
+        return self._submit('trace', (str(path), lod))
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Pide al proceso que termine y lo fuerza si sigue con una ventana abierta."""
+        with self._lock:
+            process, conn = self.process, self.conn
+            self.process = self.conn = None
+            self.pending = []
+        if process is None:
+            return
+        try:
+            conn.send(None)
+        except OSError:
+            pass
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        conn.close()
@@ -0,0 +1,87 @@
+"""
+Referencias compartidas por los tests: la búsqueda recursiva anterior al
+motor iterativo y un generador de instancias aleatorias con semilla fija.
+"""
+import random
+from math import gcd
+
+
+SEED = 20261018
+
+
+def busqueda_recursiva(denominations, limits, target_amount, prune=True, order=None):
+    """
+    Referencia: la búsqueda recursiva anterior al motor iterativo, con las
+    podas de suma máxima y mcd y el orden de búsqueda opcional.
+    Devuelve (pasos, soluciones) con la forma de iter_steps.
+    """
+    n = len(denominations)
+    if order == 'desc':
+        permutation = sorted(range(n), key=lambda i: -denominations[i])
+    else:
+        permutation = list(range(n))
+    denoms = [denominations[i] for i in permutation]
+    lims = [limits[i] for i in permutation]
+    suffix_max = [0] * (n + 1)
+    suffix_gcd = [0] * (n + 1)
+    for pos in range(n - 1, -1, -1):
+        suffix_max[pos] = suffix_max[pos + 1] + denoms[pos] * lims[pos]
+        suffix_gcd[pos] = gcd(suffix_gcd[pos + 1], denoms[pos]) if lims[pos] else suffix_gcd[pos + 1]
+
+    current = [0] * n
+    steps = []
+    solutions = []
+
+    def caller_order(pos):
+        combination = [0] * n
+        for level in range(pos):
+            combination[permutation[level]] = current[level]
+        return combination
+
+    def step(pos, current_sum, status):
+        steps.append({
+            'pos': pos,
+            'current_sum': current_sum,
+            'combination': caller_order(pos),
+            'status': status,
+        })
+
+    def walk(pos, current_sum):
+        step(pos, current_sum, 'explorando')
+        if current_sum > target_amount:
+            step(pos, current_sum, 'podado')
+            return
+        if current_sum == target_amount:
+            solutions.append({'combination': caller_order(pos), 'sum': current_sum})
+            step(pos, current_sum, 'solución')
+            return
+        if pos == n:
+            step(pos, current_sum, 'rama muerta')
+            return
+        remaining = target_amount - current_sum
+        if prune:
+            if remaining > suffix_max[pos]:
+                step(pos, current_sum, 'inalcanzable')
+                return
+            if remaining % suffix_gcd[pos]:
+                step(pos, current_sum, 'no divisible')
+                return
+            max_count = min(lims[pos], remaining // denoms[pos] + 1)
+        else:
+            max_count = lims[pos]
+        for count in range(max_count + 1):
+            current[pos] = count
+            walk(pos + 1, current_sum + count * denoms[pos])
+
+    walk(0, 0)
+    return steps, solutions
+
+
+def instancias(count, max_denominations=5, max_value=12, max_limit=4, max_target=40):
+    rng = random.Random(SEED)
+    for _ in range(count):
+        n = rng.randint(1, max_denominations)
+        base = rng.choice([1, 1, 1, 2, 3])
+        denominations = [base * rng.randint(1, max_value) for _ in range(n)]
+        limits = [rng.randint(0, max_limit) for _ in range(n)]
+        yield denominations, limits, rng.randint(0, max_target)
@@ -0,0 +1,68 @@
+"""
+AllTargetsTable contra contar_soluciones y dp_cambio_minimo para cada
+cantidad, y save/load, también con conteos que no caben en 64 bits.
+"""
+import tempfile
+import unittest
+from math import comb
+
+from referencia import instancias
+from src.all_targets import AllTargetsTable
+from src.knapsack import contar_soluciones, dp_cambio_minimo
+
+
+class AllTargetsTableTest(unittest.TestCase):
+
+    def assertTablaCorrecta(self, table, amounts=None):
+        for amount in amounts if amounts is not None else range(table.max_amount + 1):
+            best = dp_cambio_minimo(table.denominations, table.limits, amount)
+            self.assertEqual(table.count(amount), contar_soluciones(table.denominations, table.limits, amount))
+            self.assertEqual(table.feasible(amount), best is not None)
+            if best is None:
+                self.assertIsNone(table.min_coins(amount))
+                self.assertIsNone(table.witness(amount))
+                continue
+            witness = table.witness(amount)
+            self.assertEqual(table.min_coins(amount), sum(best['combination']))
+            self.assertEqual(sum(witness['combination']), sum(best['combination']))
+            self.assertEqual(sum(c * d for c, d in zip(witness['combination'], table.denominations)), amount)
+            self.assertTrue(all(c <= l for c, l in zip(witness['combination'], table.limits)))
+
+    def test_contra_programacion_dinamica(self):
+        for denominations, limits, target in instancias(120, max_target=60):
+            with self.subTest(denominations=denominations, limits=limits):
+                table = AllTargetsTable(denominations, limits, target)
+                self.assertTablaCorrecta(table)
+                self.assertEqual(table.count(-1), 0)
+                self.assertEqual(table.count(target + 1), 0)
+                self.assertFalse(table.feasible(target + 1))
+
+    def test_guardar_y_abrir(self):
+        table = AllTargetsTable([1, 2, 5, 10], [10, 6, 4, 2], 80)
+        for mmap in (True, False):
+            with self.subTest(mmap=mmap), tempfile.TemporaryDirectory() as directory:
+                table.save(directory)
+                loaded = AllTargetsTable.load(directory, mmap=mmap)
+                self.assertTablaCorrecta(loaded)
+                self.assertEqual(loaded.nbytes, table.nbytes)
+                del loaded      # Soltar el mapeo antes de borrar el directorio
+
+    def test_conteos_de_mas_de_64_bits(self):
+        # 2**70 combinaciones posibles: los conteos se guardan como enteros de Python
+        table = AllTargetsTable([1] * 70, [1] * 70, 70)
+        self.assertEqual(table.count(35), comb(70, 35))
+        self.assertGreater(table.count(35), 2 ** 64)
+        with tempfile.TemporaryDirectory() as directory:
+            table.save(directory)
+            loaded = AllTargetsTable.load(directory)
+            self.assertEqual([loaded.count(a) for a in range(71)], [comb(70, a) for a in range(71)])
+            self.assertEqual(loaded.min_coins(35), 35)
+            del loaded
+
+    def test_denominaciones_no_positivas(self):
+        with self.assertRaises(ValueError):
+            AllTargetsTable([0, 1], [1, 1], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Lectura de casos en el formato de attachments/casos_cambio_exacto.txt:
+el archivo de ejemplo completo y cada error de formato, con su línea.
+"""
+import unittest
+from pathlib import Path
+
+from src.batch import leer_casos
+
+
+CASOS = Path(__file__).resolve().parent.parent / 'attachments' / 'casos_cambio_exacto.txt'
+
+
+class LeerCasosTest(unittest.TestCase):
+
+    def error(self, text):
+        with self.assertRaises(ValueError) as context:
+            list(leer_casos(text.splitlines(), source='casos.txt'))
+        return str(context.exception)
+
+    def test_archivo_de_ejemplo(self):
+        with open(CASOS, encoding='utf-8') as lines:
+            cases = list(leer_casos(lines))
+        self.assertEqual(len(cases), 20)
+        self.assertEqual(cases[0], {
+            'name': 'Caso 1: 3 denominaciones, límites [3 2 1], objetivo 5',
+            'denominations': [1, 2, 5],
+            'limits': [3, 2, 1],
+            'target': 5
+        })
+
+    def test_sin_comentario(self):
+        cases = list(leer_casos(['2', '1 2', '1 1', '3', '', '1', '4', '2', '8']))
+        self.assertEqual([case['name'] for case in cases], [None, None])
+        self.assertEqual(cases[1]['target'], 8)
+
+    def test_no_entero(self):
+        self.assertIn("casos.txt:2: se esperaban enteros", self.error("1\n1 x\n1\n3"))
+
+    def test_caso_incompleto_antes_del_comentario(self):
+        self.assertEqual(
+            self.error("# A\n1\n2\n# B\n1\n2\n1\n2"),
+            "casos.txt:4: caso incompleto antes del comentario"
+        )
+
+    def test_cantidad_u_objetivo_con_varios_enteros(self):
+        self.assertEqual(
+            self.error("1 2\n1\n1\n3"),
+            "casos.txt:4: la cantidad y el objetivo deben ser un solo entero"
+        )
+        self.assertEqual(
+            self.error("1\n1\n1\n3 4"),
+            "casos.txt:4: la cantidad y el objetivo deben ser un solo entero"
+        )
+
+    def test_cantidad_distinta(self):
+        self.assertEqual(self.error("2\n1 2\n1\n3"), "casos.txt:4: se esperaban 2 denominaciones y límites")
+
+    def test_denominaciones_no_positivas(self):
+        self.assertEqual(self.error("2\n0 2\n1 1\n2"), "casos.txt:4: las denominaciones deben ser positivas")
+
+    def test_incompleto_al_final(self):
+        self.assertEqual(self.error("1\n5\n1\n5\n\n1\n5"), "casos.txt: caso incompleto al final del archivo")
+
+    def test_errores_despues_de_casos_validos(self):
+        # Los casos anteriores al error se generan antes de fallar
+        cases = leer_casos("1\n5\n1\n5\n1\nx".splitlines())
+        self.assertEqual(next(cases)['target'], 5)
+        with self.assertRaises(ValueError):
+            next(cases)
+
+
+if __name__ == "__main__":
+    unittest.main()
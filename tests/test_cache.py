@@ -0,0 +1,109 @@
+"""
+ResultCache: la forma canónica de las instancias (denominaciones repetidas
+y en cualquier orden) y la caché en memoria y en disco.
+"""
+import random
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from referencia import SEED, instancias
+from src.backtraking import backtrack_cambio_exacto
+from src.cache import ResultCache, canonical_instance, from_canonical, to_canonical
+
+
+def soluciones(denominations, limits, target):
+    return backtrack_cambio_exacto(denominations, limits, target, trace='none')['solutions']
+
+
+class FormaCanonicaTest(unittest.TestCase):
+
+    def test_canonical_instance(self):
+        self.assertEqual(canonical_instance([5, 1, 5, 2], [1, 2, 3, 4]), ((1, 2, 5), (2, 4, 4), [2, 0, 2, 1]))
+        with self.assertRaises(ValueError):
+            canonical_instance([1, 2], [1])
+
+    def test_ida_y_vuelta(self):
+        # Valores chicos para que haya muchas denominaciones repetidas
+        for denominations, limits, target in instancias(300, max_denominations=6, max_value=4, max_target=20):
+            with self.subTest(denominations=denominations, limits=limits, target=target):
+                expected = soluciones(denominations, limits, target)
+                canonical_denominations, canonical_limits, mapping = canonical_instance(denominations, limits)
+                combinations = to_canonical(expected, mapping, len(canonical_denominations))
+                canonical = soluciones(list(canonical_denominations), list(canonical_limits), target)
+                self.assertEqual(combinations, [tuple(s['combination']) for s in canonical])
+                self.assertEqual(from_canonical(combinations, denominations, limits, mapping, target), expected)
+
+    def test_instancias_equivalentes_comparten_entrada(self):
+        rng = random.Random(SEED)
+        cache = ResultCache(path=None)
+        for denominations, limits, target in instancias(150, max_denominations=6, max_value=4, max_target=20):
+            order = list(range(len(denominations)))
+            rng.shuffle(order)
+            permuted_denominations = [denominations[i] for i in order]
+            permuted_limits = [limits[i] for i in order]
+            with self.subTest(denominations=denominations, limits=limits, order=order, target=target):
+                cache.clear()
+                cache.put_solutions(denominations, limits, target, soluciones(denominations, limits, target))
+                self.assertEqual(
+                    cache.get_solutions(permuted_denominations, permuted_limits, target),
+                    soluciones(permuted_denominations, permuted_limits, target)
+                )
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'cache.sqlite'
+
+    def uso(self):
+        with sqlite3.connect(self.path) as db:
+            total = db.execute('SELECT COALESCE(SUM(bytes), 0) FROM resultados').fetchone()[0]
+            used = db.execute('SELECT bytes FROM uso').fetchone()[0]
+        return total, used
+
+    def test_persistente(self):
+        cache = ResultCache(self.path)
+        cache.put('a', [1, 2, 3])
+        self.assertEqual(cache.get('a'), [1, 2, 3])
+        self.assertIsNone(cache.get('b'))
+        cache.close()
+
+        cache = ResultCache(self.path)
+        self.assertEqual(cache.get('a'), [1, 2, 3])
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        cache.close()
+
+    def test_desalojo_en_disco(self):
+        cache = ResultCache(self.path, memory_bytes=0, disk_bytes=4000)
+        for key in range(200):
+            cache.put(str(key), bytes(100))
+            total, used = self.uso()
+            self.assertEqual(used, total)
+            self.assertLessEqual(used, 4000)
+        self.assertIsNone(cache.get('0'))
+        self.assertEqual(cache.get('199'), bytes(100))
+        cache.put('199', bytes(300))
+        self.assertEqual(self.uso()[1], self.uso()[0])
+        cache.clear()
+        self.assertEqual(self.uso(), (0, 0))
+        cache.close()
+
+    def test_lo_usado_no_se_desaloja_primero(self):
+        cache = ResultCache(self.path, memory_bytes=0, disk_bytes=2000)
+        cache.TOUCH_BATCH = 1
+        for key in range(10):
+            cache.put(str(key), bytes(100))
+        cache.get('0')
+        for key in range(10, 20):
+            cache.put(str(key), bytes(100))
+        self.assertIsNotNone(cache.get('0'))
+        self.assertIsNone(cache.get('1'))
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+"""
+Comprobación aleatoria (con semilla fija) de que el motor iterativo da lo
+mismo que la búsqueda recursiva original: mismos pasos y mismas soluciones,
+con y sin podas y en los dos órdenes de búsqueda.
+Se corre con: python -m unittest discover -s tests
+"""
+import sys
+import unittest
+
+from referencia import busqueda_recursiva, instancias
+from src.backtraking import backtrack_cambio_exacto
+
+
+class EquivalenciaRecursivaTest(unittest.TestCase):
+
+    def test_pasos_y_soluciones(self):
+        for instance in instancias(250):
+            for prune in (False, True):
+                for order in (None, 'desc'):
+                    with self.subTest(instance=instance, prune=prune, order=order):
+                        expected_steps, expected_solutions = busqueda_recursiva(*instance, prune=prune, order=order)
+                        result = backtrack_cambio_exacto(*instance, prune=prune, order=order)
+                        self.assertEqual(list(result['steps']), expected_steps)
+                        self.assertEqual(result['solutions'], expected_solutions)
+
+    def test_sin_limite_de_recursion(self):
+        depth = sys.getrecursionlimit() + 500
+        result = backtrack_cambio_exacto([1] * depth, [1] * depth, 1, trace='counters')
+        self.assertEqual(len(result['solutions']), depth)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Hooks de la búsqueda: no cambian el resultado y LevelProfiler cuenta por
+nivel lo mismo que los pasos de la búsqueda de referencia.
+"""
+import json
+import unittest
+from collections import Counter
+
+from referencia import busqueda_recursiva, instancias
+from src.backtraking import backtrack_cambio_exacto
+from src.hooks import LevelProfiler, SearchHooks
+
+
+class Eventos(SearchHooks):
+    """Registra cada evento como (nombre, nivel, suma[, motivo])."""
+
+    def __init__(self):
+        self.events = []
+
+    def on_explore(self, pos, current_sum):
+        self.events.append(('explorando', pos, current_sum))
+
+    def on_prune(self, pos, current_sum, reason):
+        self.events.append((reason, pos, current_sum))
+
+    def on_solution(self, pos, current_sum):
+        self.events.append(('solución', pos, current_sum))
+
+    def on_dead_end(self, pos, current_sum):
+        self.events.append(('rama muerta', pos, current_sum))
+
+
+class HooksTest(unittest.TestCase):
+
+    def test_sin_efecto_en_el_resultado(self):
+        for instance in instancias(250):
+            with self.subTest(instance=instance):
+                _, expected = busqueda_recursiva(*instance)
+                plain = backtrack_cambio_exacto(*instance, trace='counters')
+                hooked = backtrack_cambio_exacto(*instance, trace='counters', hooks=[SearchHooks(), Eventos()])
+                self.assertEqual(hooked['solutions'], expected)
+                self.assertEqual(hooked['steps'].as_dict(), plain['steps'].as_dict())
+
+    def test_eventos_en_orden(self):
+        for instance in instancias(100):
+            with self.subTest(instance=instance):
+                expected_steps, _ = busqueda_recursiva(*instance)
+                hooks = Eventos()
+                backtrack_cambio_exacto(*instance, trace='none', hooks=hooks)
+                self.assertEqual(
+                    hooks.events,
+                    [(step['status'], step['pos'], step['current_sum']) for step in expected_steps]
+                )
+
+    def test_level_profiler(self):
+        for instance in instancias(100):
+            with self.subTest(instance=instance):
+                expected_steps, expected_solutions = busqueda_recursiva(*instance)
+                profiler = LevelProfiler()
+                backtrack_cambio_exacto(*instance, trace='none', hooks=profiler)
+                data = json.loads(profiler.to_json())
+                nodes = Counter(step['pos'] for step in expected_steps if step['status'] == 'explorando')
+                by_level = {level['level']: level['nodes'] for level in data['levels'] if level['nodes']}
+                self.assertEqual(by_level, dict(nodes))
+                self.assertEqual(data['nodes'], sum(nodes.values()))
+                self.assertEqual(data['solutions'], len(expected_solutions))
+                self.assertIn('cambio_exacto_nodes_total{level="0"} 1', profiler.to_prometheus())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+iter_steps e iter_solutions contra la búsqueda recursiva de referencia, y
+comprobación de que son perezosos.
+"""
+import unittest
+from itertools import islice
+
+from referencia import busqueda_recursiva, instancias
+from src.backtraking import iter_solutions, iter_steps
+
+
+class IteradoresTest(unittest.TestCase):
+
+    def test_contra_referencia(self):
+        for instance in instancias(250):
+            for prune in (False, True):
+                for order in (None, 'desc'):
+                    with self.subTest(instance=instance, prune=prune, order=order):
+                        expected_steps, expected_solutions = busqueda_recursiva(*instance, prune=prune, order=order)
+                        self.assertEqual(list(iter_steps(*instance, prune=prune, order=order)), expected_steps)
+                        self.assertEqual(list(iter_solutions(*instance, prune=prune, order=order)), expected_solutions)
+
+    def test_perezosos(self):
+        # 2**60 combinaciones: solo termina si no se recorre todo el árbol
+        denominations = [1] * 60
+        limits = [1] * 60
+        first = list(islice(iter_solutions(denominations, limits, 30), 3))
+        self.assertEqual(len(first), 3)
+        self.assertTrue(all(sum(solution['combination']) == 30 for solution in first))
+        self.assertEqual(next(iter_steps(denominations, limits, 30))['status'], 'explorando')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Programaciones dinámicas y búsqueda de menor costo de knapsack.py contra
+la enumeración completa de backtrack_cambio_exacto en instancias
+aleatorias con semilla fija.
+"""
+import random
+import unittest
+from math import comb
+
+from referencia import SEED, instancias
+from src.backtraking import backtrack_cambio_exacto
+from src.knapsack import (
+    contar_soluciones, dp_cambio_minimo, iter_menor_costo, menos_monedas, top_k_de_soluciones, top_k_soluciones,
+)
+
+
+class CambioMinimoTest(unittest.TestCase):
+
+    def test_contra_enumeracion(self):
+        for instance in instancias(400, max_target=60):
+            with self.subTest(instance=instance):
+                solutions = backtrack_cambio_exacto(*instance, trace='none')['solutions']
+                self.assertEqual(dp_cambio_minimo(*instance), menos_monedas(solutions))
+
+    def test_mcd_sin_solucion(self):
+        self.assertIsNone(dp_cambio_minimo([4, 6], [3, 3], 7))
+
+    def test_objetivo_grande_con_mcd(self):
+        best = dp_cambio_minimo([1_000_000], [10], 5_000_000)
+        self.assertEqual(best['combination'], [5])
+
+    def test_denominaciones_no_positivas(self):
+        with self.assertRaises(ValueError):
+            dp_cambio_minimo([0, 2], [1, 1], 2)
+
+
+class ConteoTest(unittest.TestCase):
+
+    def test_contra_enumeracion(self):
+        for instance in instancias(400, max_target=60):
+            with self.subTest(instance=instance):
+                solutions = backtrack_cambio_exacto(*instance, trace='none')['solutions']
+                self.assertEqual(contar_soluciones(*instance), len(solutions))
+
+    def test_sin_enumerar(self):
+        # Una por cada cantidad de doses, de 0 a 50
+        self.assertEqual(contar_soluciones([1, 2], [100, 50], 100), 51)
+        # Elegir 20 de 40 monedas de 1: demasiadas para enumerarlas
+        self.assertEqual(contar_soluciones([1] * 40, [1] * 40, 20), comb(40, 20))
+
+    def test_objetivo_cero(self):
+        self.assertEqual(contar_soluciones([3, 5], [2, 2], 0), 1)
+
+
+class MenorCostoTest(unittest.TestCase):
+
+    def test_top_k_contra_enumeracion(self):
+        for instance in instancias(400, max_target=60):
+            with self.subTest(instance=instance):
+                solutions = backtrack_cambio_exacto(*instance, trace='none')['solutions']
+                for k in (1, 5):
+                    self.assertEqual(top_k_soluciones(*instance, k), top_k_de_soluciones(solutions, k))
+
+    def test_orden_completo_con_pesos(self):
+        rng = random.Random(SEED)
+        for denominations, limits, target in instancias(200, max_target=40):
+            weights = [rng.randint(0, 5) for _ in denominations]
+            with self.subTest(denominations=denominations, limits=limits, target=target, weights=weights):
+                solutions = backtrack_cambio_exacto(denominations, limits, target, trace='none')['solutions']
+                costs = [sum(w * c for w, c in zip(weights, s['combination'])) for s in solutions]
+                # sorted es estable: ante empates queda el orden del backtracking
+                expected = sorted(
+                    ({**s, 'cost': cost} for s, cost in zip(solutions, costs)), key=lambda s: s['cost']
+                )
+                self.assertEqual(list(iter_menor_costo(denominations, limits, target, weights)), expected)
+
+    def test_mcd_sin_solucion(self):
+        self.assertEqual(top_k_soluciones([4, 6], [3, 3], 7, 3), [])
+
+    def test_sin_enumerar(self):
+        # C(40, 20) soluciones: las primeras salen sin recorrer las demás
+        best = top_k_soluciones([1] * 40 + [20], [1] * 40 + [1], 20, 2)
+        self.assertEqual([s['cost'] for s in best], [1, 20])
+
+    def test_pesos_invalidos(self):
+        with self.assertRaises(ValueError):
+            top_k_soluciones([1, 2], [1, 1], 3, 1, weights=[1])
+        with self.assertRaises(ValueError):
+            top_k_soluciones([1, 2], [1, 1], 3, 1, weights=[1, -1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+MemoCache: la búsqueda con memoria da las mismas soluciones que la
+referencia, cada acierto corresponde a un subárbol saltado y la caché sigue
+siendo correcta al reutilizarla, al desalojar y al cambiar de instancia.
+"""
+import unittest
+
+from referencia import busqueda_recursiva, instancias
+from src.backtraking import backtrack_cambio_exacto
+from src.memo import MemoCache
+from src.step_trace import MEMORIZADO
+
+
+class MemoCacheTest(unittest.TestCase):
+
+    def test_mismas_soluciones(self):
+        for instance in instancias(250):
+            with self.subTest(instance=instance):
+                _, expected = busqueda_recursiva(*instance)
+                memo = MemoCache()
+                result = backtrack_cambio_exacto(*instance, trace='counters', memo=memo)
+                self.assertEqual(result['solutions'], expected)
+                self.assertEqual(memo.hits, result['steps'].by_status[MEMORIZADO])
+
+    def test_reutilizada_entre_objetivos(self):
+        denominations, limits = [2, 3, 5, 7], [3, 3, 2, 2]
+        memo = MemoCache()
+        for target in range(0, 45):
+            with self.subTest(target=target):
+                _, expected = busqueda_recursiva(denominations, limits, target)
+                result = backtrack_cambio_exacto(denominations, limits, target, trace='none', memo=memo)
+                self.assertEqual(result['solutions'], expected)
+
+    def test_desalojo(self):
+        memo = MemoCache(maxsize=2)
+        for instance in instancias(100):
+            with self.subTest(instance=instance):
+                _, expected = busqueda_recursiva(*instance)
+                self.assertEqual(backtrack_cambio_exacto(*instance, trace='none', memo=memo)['solutions'], expected)
+                self.assertLessEqual(len(memo), 2)
+
+    def test_bind_vacia_otra_instancia(self):
+        memo = MemoCache()
+        memo.bind([1, 2], [1, 1])
+        memo.put(1, 3, 0)
+        memo.bind([1, 2], [1, 1])
+        self.assertTrue(memo.is_dead(1, 3))
+        memo.bind([1, 3], [1, 1])
+        self.assertFalse(memo.is_dead(1, 3))
+        self.assertEqual(len(memo), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
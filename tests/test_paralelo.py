@@ -0,0 +1,45 @@
+"""
+La búsqueda paralela da las mismas soluciones, en el mismo orden, y los
+mismos contadores de pasos que la búsqueda en serie.
+"""
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from referencia import instancias
+from src.backtraking import backtrack_cambio_exacto
+from src.parallel import backtrack_cambio_exacto_paralelo
+
+
+class ParaleloTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def test_serie_contra_paralelo(self):
+        for instance in instancias(60, max_denominations=6):
+            for prune in (False, True):
+                with self.subTest(instance=instance, prune=prune):
+                    serial = backtrack_cambio_exacto(*instance, trace='counters', prune=prune)
+                    parallel = backtrack_cambio_exacto_paralelo(
+                        *instance, workers=2, split_depth=2, trace='counters', prune=prune, executor=self.executor
+                    )
+                    self.assertEqual(parallel['solutions'], serial['solutions'])
+                    self.assertEqual(parallel['steps'].as_dict(), serial['steps'].as_dict())
+
+    def test_orden_descendente(self):
+        for instance in instancias(30, max_denominations=6):
+            with self.subTest(instance=instance):
+                serial = backtrack_cambio_exacto(*instance, trace='counters', order='desc')
+                parallel = backtrack_cambio_exacto_paralelo(
+                    *instance, workers=2, split_depth=2, order='desc', executor=self.executor
+                )
+                self.assertEqual(parallel['solutions'], serial['solutions'])
+
+
+if __name__ == "__main__":
+    unittest.main()
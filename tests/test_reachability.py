@@ -0,0 +1,48 @@
+"""
+ReachabilityTable contra la enumeración de sumas, y la búsqueda con poda
+por alcanzables contra la búsqueda de referencia.
+"""
+import unittest
+from itertools import product
+
+from referencia import busqueda_recursiva, instancias
+from src.backtraking import backtrack_cambio_exacto
+from src.reachability import ReachabilityTable
+
+
+def sumas(denominations, limits):
+    """Todas las sumas que se forman con las denominaciones y sus límites."""
+    return {
+        sum(count * denom for count, denom in zip(counts, denominations))
+        for counts in product(*(range(limit + 1) for limit in limits))
+    }
+
+
+class ReachabilityTableTest(unittest.TestCase):
+
+    def test_contra_enumeracion(self):
+        for denominations, limits, target in instancias(150):
+            with self.subTest(denominations=denominations, limits=limits):
+                table = ReachabilityTable(denominations, limits, target + 20)
+                for pos in range(len(denominations) + 1):
+                    expected = sumas(denominations[pos:], limits[pos:])
+                    for amount in range(table.max_amount + 1):
+                        self.assertEqual(table.reachable(pos, amount), amount in expected)
+                    # Fuera del rango de la tabla la respuesta es siempre no
+                    self.assertFalse(table.reachable(pos, -1))
+                    self.assertFalse(table.reachable(pos, table.max_amount + 1))
+
+    def test_busqueda_con_alcanzables(self):
+        for instance in instancias(250):
+            with self.subTest(instance=instance):
+                _, expected = busqueda_recursiva(*instance)
+                result = backtrack_cambio_exacto(*instance, trace='none', reachability=True)
+                self.assertEqual(result['solutions'], expected)
+
+    def test_max_amount_negativo(self):
+        with self.assertRaises(ValueError):
+            ReachabilityTable([1], [1], -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+SolutionPager: páginas, orden por cantidad de monedas y filtro, contra la
+lista completa de soluciones, y lectura perezosa de la fuente.
+"""
+import unittest
+from itertools import count
+
+from src.backtraking import backtrack_cambio_exacto, iter_solutions
+from src.solution_pager import SORT_FEWEST, SORT_FOUND, SORT_MOST, SolutionPager, coin_count
+
+
+INSTANCE = ([1, 2, 5, 10], [10, 6, 4, 2], 27)
+
+
+class SolutionPagerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        solutions = backtrack_cambio_exacto(*INSTANCE, trace='none')['solutions']
+        cls.numbered = list(enumerate(solutions, start=1))
+
+    def pages(self, pager):
+        """Todas las páginas, en orden, hasta que has_next diga que no hay más."""
+        pages = [pager.page(0)]
+        while pager.has_next(len(pages) - 1):
+            pages.append(pager.page(len(pages)))
+        return pages
+
+    def test_orden_de_hallazgo(self):
+        pager = SolutionPager(lambda: iter_solutions(*INSTANCE), page_size=7)
+        pages = self.pages(pager)
+        self.assertTrue(all(len(page) == 7 for page in pages[:-1]))
+        self.assertEqual([item for page in pages for item in page], self.numbered)
+        self.assertEqual(pager.total, len(self.numbered))
+        self.assertEqual(pager.page(len(pages)), [])
+
+    def test_orden_por_monedas(self):
+        for sort, sign in ((SORT_FEWEST, 1), (SORT_MOST, -1)):
+            with self.subTest(sort=sort):
+                pager = SolutionPager(lambda: iter_solutions(*INSTANCE), page_size=5, sort=sort)
+                expected = sorted(self.numbered, key=lambda item: (sign * coin_count(item[1]), item[0]))
+                self.assertEqual([item for page in self.pages(pager) for item in page], expected)
+
+    def test_filtro(self):
+        pager = SolutionPager(lambda: iter(s for _, s in self.numbered), page_size=4, min_coins=8, max_coins=10)
+        expected = [(number, s) for number, s in self.numbered if 8 <= coin_count(s) <= 10]
+        self.assertTrue(expected)
+        self.assertEqual([item for page in self.pages(pager) for item in page], expected)
+        self.assertEqual(pager.total, len(expected))
+
+    def test_fuente_perezosa(self):
+        # Una fuente infinita: la primera página solo lee lo que necesita
+        source = lambda: ({'combination': [n], 'sum': n} for n in count())
+        pager = SolutionPager(source, page_size=3, sort=SORT_FOUND)
+        self.assertEqual([number for number, _ in pager.page(1)], [4, 5, 6])
+        self.assertTrue(pager.has_next(1))
+        self.assertIsNone(pager.total)
+
+    def test_parametros_invalidos(self):
+        with self.assertRaises(ValueError):
+            SolutionPager(lambda: iter([]), sort='otro')
+        with self.assertRaises(ValueError):
+            SolutionPager(lambda: iter([]), page_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+write_trace y TraceFile: la traza leída del archivo es la misma que se
+guardó, con y sin orden de búsqueda, y los archivos dañados se rechazan.
+"""
+import tempfile
+import unittest
+from pathlib import Path
+
+from referencia import instancias
+from src.backtraking import backtrack_cambio_exacto
+from src.trace_file import TraceFile, write_trace
+
+
+class TraceFileTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'traza.cxtrace'
+
+    def roundtrip(self, denominations, limits, target, order):
+        trace = backtrack_cambio_exacto(denominations, limits, target, order=order)['steps']
+        write_trace(self.path, trace, denominations, limits, target)
+        loaded = TraceFile(self.path)
+        self.addCleanup(loaded.close)
+        return trace, loaded
+
+    def test_ida_y_vuelta(self):
+        for instance in instancias(60):
+            for order in (None, 'desc'):
+                with self.subTest(instance=instance, order=order):
+                    trace, loaded = self.roundtrip(*instance, order)
+                    self.assertEqual((loaded.denominations, loaded.limits, loaded.target_amount), instance)
+                    self.assertEqual(loaded.order, trace.order)
+                    self.assertEqual(list(loaded), list(trace))
+                    self.assertEqual(loaded.counters().as_dict(), trace.counters().as_dict())
+                    last = len(trace) - 1
+                    self.assertEqual(loaded.combination(last), trace.combination(last))
+
+    def test_orden_descendente(self):
+        # Con tres denominaciones el orden ocupa 12 bytes y la cabecera se rellena
+        trace, loaded = self.roundtrip([1, 5, 2], [2, 1, 3], 6, 'desc')
+        self.assertEqual(loaded.order, [1, 2, 0])
+        self.assertEqual(list(loaded), list(trace))
+
+    def test_solo_lectura(self):
+        _, loaded = self.roundtrip([1, 2], [1, 1], 3, None)
+        with self.assertRaises(TypeError):
+            loaded.append(0, 0, 0, 0, -1)
+
+    def test_archivos_invalidos(self):
+        self.path.write_bytes(b'no es una traza' * 10)
+        with self.assertRaisesRegex(ValueError, "no es un archivo de traza"):
+            TraceFile(self.path)
+
+        trace = backtrack_cambio_exacto([1, 2], [2, 2], 4)['steps']
+        write_trace(self.path, trace, [1, 2], [2, 2], 4)
+        data = self.path.read_bytes()
+        self.path.write_bytes(data[:-1])
+        with self.assertRaisesRegex(ValueError, "incompleto"):
+            TraceFile(self.path)
+        self.path.write_bytes(data[:10])
+        with self.assertRaisesRegex(ValueError, "incompleto"):
+            TraceFile(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()